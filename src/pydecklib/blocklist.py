@@ -0,0 +1,234 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+
+class BlockList:
+
+    """
+    A mutable sequence of bytes split into small blocks, with a Fenwick tree
+    over the block lengths. It behaves like the subset of ``bytearray`` used
+    by decks, but finding, removing or inserting the byte at a given index
+    costs O(log(n / load)) to locate the block plus an O(load) move inside
+    it, instead of an O(n) move of the whole buffer.
+
+    Blocks are split when they grow past twice the load and dropped when they
+    become empty. Both rebuild the Fenwick tree, which happens at most once
+    every ``load`` operations.
+
+    :param data: Initial content.
+    :type data: Iterable[int]
+    :param load: Target number of bytes per block.
+    :type load: int
+
+    :Example:
+        >>> codes = BlockList(range(52))
+        >>> codes.pop(10)
+        10
+        >>> codes.insert(0, 10)
+        >>> codes[0], len(codes)
+        (10, 52)
+    """
+
+    __slots__ = ('_blocks', '_tree', '_len', '_load')
+
+    def __init__(self, data: Iterable[int] = b'', load: int = 64):
+
+        self._load = load
+        self._set(bytes(data))
+
+    def _set(self, data: bytes) -> None:
+
+        """
+        Private method to replace the whole content, cutting it in blocks.
+        """
+
+        load = self._load
+        self._blocks: List[bytearray] = [
+            bytearray(data[i:i + load]) for i in range(0, len(data), load)
+        ]
+        self._len = len(data)
+        self._tree: Optional[List[int]] = None
+
+    def _build_tree(self) -> List[int]:
+
+        """
+        Private method to build the Fenwick tree of the block lengths, in
+        O(number of blocks).
+        """
+
+        tree = [0] + [len(block) for block in self._blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+
+        self._tree = tree
+
+        return tree
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+
+        """
+        Private method to find the block holding an index, and the offset of
+        the index in that block, by descending the Fenwick tree.
+        """
+
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("BlockList index out of range")
+
+        tree = self._tree if self._tree is not None else self._build_tree()
+        position = 0
+        step = 1 << (len(tree) - 1).bit_length()
+
+        while step:
+            following = position + step
+            if following < len(tree) and tree[following] <= index:
+                position = following
+                index -= tree[following]
+            step >>= 1
+
+        return position, index
+
+    def _resize(self, block: int, delta: int) -> None:
+
+        """
+        Private method to record that a block grew or shrank by delta,
+        splitting or dropping it when needed.
+        """
+
+        self._len += delta
+        size = len(self._blocks[block])
+
+        if size == 0:
+            del self._blocks[block]
+            self._tree = None
+        elif size > 2 * self._load:
+            half = self._blocks[block][self._load:]
+            del self._blocks[block][self._load:]
+            self._blocks.insert(block + 1, half)
+            self._tree = None
+        elif self._tree is not None:
+            tree = self._tree
+            i = block + 1
+            while i < len(tree):
+                tree[i] += delta
+                i += i & -i
+
+    def insert(self, index: int, value: int) -> None:
+
+        """
+        Inserts a byte before the given index, in O(log(n / load) + load).
+        """
+
+        if index < 0:
+            index = max(0, index + self._len)
+
+        if index >= self._len:
+            self.append(value)
+            return
+
+        block, offset = self._locate(index)
+        self._blocks[block].insert(offset, value)
+        self._resize(block, 1)
+
+    def append(self, value: int) -> None:
+
+        """
+        Appends a byte at the end.
+        """
+
+        if not self._blocks:
+            self._blocks.append(bytearray())
+            self._tree = None
+
+        self._blocks[-1].append(value)
+        self._resize(len(self._blocks) - 1, 1)
+
+    def pop(self, index: int = -1) -> int:
+
+        """
+        Removes and returns the byte at the given index, in
+        O(log(n / load) + load).
+        """
+
+        if not self._len:
+            raise IndexError("pop from empty BlockList")
+
+        block, offset = self._locate(index)
+        value = self._blocks[block].pop(offset)
+        self._resize(block, -1)
+
+        return value
+
+    def translate(
+        self, table: Optional[bytes], delete: bytes = b''
+    ) -> bytearray:
+
+        """
+        Returns a copy of the content with bytes mapped and deleted, like
+        ``bytearray.translate``.
+        """
+
+        return self[:].translate(table, delete)
+
+    def __len__(self) -> int:
+
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+
+        for block in self._blocks:
+            yield from block
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, bytearray]:
+
+        if isinstance(index, slice):
+            return bytearray().join(self._blocks)[index]
+
+        block, offset = self._locate(index)
+
+        return self._blocks[block][offset]
+
+    def __setitem__(self, index: Union[int, slice], value) -> None:
+
+        if isinstance(index, slice):
+            data = bytearray().join(self._blocks)
+            data[index] = value
+            self._set(data)
+            return
+
+        block, offset = self._locate(index)
+        self._blocks[block][offset] = value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+
+        if isinstance(index, slice):
+            data = bytearray().join(self._blocks)
+            del data[index]
+            self._set(data)
+            return
+
+        self.pop(index)
+
+    def __bytes__(self) -> bytes:
+
+        return b''.join(self._blocks)
+
+    def __eq__(self, other: object) -> bool:
+
+        if isinstance(other, BlockList):
+            other = bytes(other)
+        elif not isinstance(other, (bytes, bytearray)):
+            return NotImplemented
+
+        return bytes(self) == other
+
+    def __repr__(self):
+
+        return f"BlockList({bytes(self)!r})"
@@ -5,6 +5,8 @@
 from __future__ import annotations
 
 from enum import Enum
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional
 
 
 class Suit(Enum):
@@ -30,7 +32,39 @@ class Value(Enum):
     KING = 13
 
 
-class Card:
+DEFAULT_SUIT_RANKING = MappingProxyType({
+    Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
+    Suit.DIAMONDS: 3
+})
+DEFAULT_VALUE_RANKING = MappingProxyType({
+    Value.TWO: 0, Value.THREE: 1, Value.FOUR: 2, Value.FIVE: 3,
+    Value.SIX: 4, Value.SEVEN: 5, Value.EIGHT: 6, Value.NINE: 7,
+    Value.TEN: 8, Value.JACK: 9, Value.QUEEN: 10, Value.KING: 11,
+    Value.ACE: 12
+})
+
+
+class _CardMeta(type):
+
+    """
+    Metaclass of :class:`Card`, recompiling the rank table whenever one of
+    the ranking class attributes is reassigned. Rankings are stored as
+    read-only copies, so that they cannot be edited in place behind the
+    compiled table.
+    """
+
+    def __setattr__(cls, name, value):
+
+        if name in ('suit_ranking', 'value_ranking'):
+            value = MappingProxyType(dict(value))
+
+        super().__setattr__(name, value)
+
+        if name in ('suit_ranking', 'value_ranking', 'suit_ordered'):
+            cls._compile_ranking()
+
+
+class Card(metaclass=_CardMeta):
 
     """
     Represents a playing card with a suit and a value. Provides methods to
@@ -38,9 +72,24 @@ class Card:
     system defined for suits and values. The ranking can be adjusted to
     prioritise suit over value if desired.
 
+    Cards are interned, immutable and hashable: ``Card(suit, value)`` always
+    returns the same instance, so cards can be used in sets and as dict keys.
+    Two cards are equal only if they have the same suit and value, the
+    ranking is only used for ordering.
+
+    The class-level ranking is compiled into a :class:`RankingPolicy`, a
+    table of 52 integer sort keys indexed by card code, so comparisons are
+    two table lookups. The policy is rebuilt when a ranking attribute is
+    reassigned; the rankings are read-only mappings, so to change the
+    ranking, assign a new dict rather than mutating the existing one. Games
+    needing their own rules, possibly concurrently, should carry their own
+    :class:`RankingPolicy` rather than change these shared attributes.
+
     Attributes:
-        suit_ranking (dict): A dictionary mapping Suit enums to their ranks.
-        value_ranking (dict): A dictionary mapping Value enums to their ranks.
+        suit_ranking (Mapping): A read-only mapping of Suit enums to their
+                                ranks.
+        value_ranking (Mapping): A read-only mapping of Value enums to their
+                                 ranks.
         suit_ordered (bool): Flag to determine if suit is considered in
                              ranking.
 
@@ -50,26 +99,63 @@ class Card:
     :type value: Value
     """
 
-    suit_ranking = {
-        Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
-        Suit.DIAMONDS: 3
-    }
-    value_ranking = {
-        Value.TWO: 0, Value.THREE: 1, Value.FOUR: 2, Value.FIVE: 3,
-        Value.SIX: 4, Value.SEVEN: 5, Value.EIGHT: 6, Value.NINE: 7,
-        Value.TEN: 8, Value.JACK: 9, Value.QUEEN: 10, Value.KING: 11,
-        Value.ACE: 12
-    }
+    suit_ranking = DEFAULT_SUIT_RANKING
+    value_ranking = DEFAULT_VALUE_RANKING
     suit_ordered = False
 
-    def __init__(self, suit: Suit, value: Value):
+    __slots__ = ('_suit', '_value', '_code')
+
+    _interned: dict = {}
+    _by_code: list = []
+    _policy: RankingPolicy = None
+    _ranks: tuple = ()
+
+    def __new__(cls, suit: Suit, value: Value) -> Card:
+
+        """
+        Returns the card with the specified suit and value. Cards are interned:
+        there is exactly one immutable instance per suit and value, shared by
+        every deck, so building a deck only copies references.
+        """
+
+        try:
+            return cls._interned[suit, value]
+        except KeyError:
+            pass
+
+        if not isinstance(suit, Suit) or not isinstance(value, Value):
+            raise TypeError(
+                f"Expected a Suit and a Value, got {suit!r} and {value!r}"
+            )
+
+        card = super().__new__(cls)
+        object.__setattr__(card, '_suit', suit)
+        object.__setattr__(card, '_value', value)
+        object.__setattr__(
+            card, '_code', suit.value * len(Value) + value.value - 1
+        )
+
+        cls._interned[suit, value] = card
+
+        return card
+
+    @classmethod
+    def from_code(cls, code: int) -> Card:
 
         """
-        Initializes a new Card instance with the specified suit and value.
+        Gets the card matching an integer card code.
+
+        :param code: The code of the card, between 0 and 51.
+        :type code: int
+        :return: The card with this code.
+        :rtype: Card
+
+        :Example:
+            >>> Card.from_code(0)
+            Card(Suit.SPADES, Value.ACE)
         """
 
-        self._suit = suit
-        self._value = value
+        return cls._by_code[code]
 
     @property
     def value(self) -> Value:
@@ -95,35 +181,114 @@ class Card:
 
         return self._suit
 
+    @property
+    def code(self) -> int:
+
+        """
+        Gets the integer code of the card. Codes run from 0 to 51 in the
+        order of a freshly initialised deck (suit first, then value).
+
+        :return: The code of the card.
+        :rtype: int
+        """
+
+        return self._code
+
+    @property
+    def sort_key(self) -> int:
+
+        """
+        Gets the rank of the card under the current ranking, as an integer
+        that can be used as a sort key.
+
+        :return: The rank of the card.
+        :rtype: int
+
+        :Example:
+            >>> Card(Suit.SPADES, Value.ACE).sort_key
+            12
+        """
+
+        return Card._ranks[self._code]
+
+    @classmethod
+    def default_ranking(cls) -> RankingPolicy:
+
+        """
+        Gets the ranking policy compiled from the class-level ranking
+        attributes.
+
+        :return: The default ranking policy.
+        :rtype: RankingPolicy
+        """
+
+        return Card._policy
+
+    @classmethod
+    def _compile_ranking(cls) -> None:
+
+        """
+        Private method to compile the class-level ranking attributes into the
+        default ranking policy.
+        """
+
+        policy = RankingPolicy(
+            cls.suit_ranking, cls.value_ranking, cls.suit_ordered
+        )
+
+        type.__setattr__(Card, '_policy', policy)
+        type.__setattr__(Card, '_ranks', policy.ranks)
+
     def _rank(self):
 
         """
-        Private method to calculate the rank of the card based on its suit and
+        Private method to get the rank of the card based on its suit and
         value.
 
         :return: The rank of the card.
         :rtype: int
         """
 
-        if self.suit_ordered:
-            rank = self.suit_ranking[self._suit] * len(self.value_ranking) + \
-                   self.value_ranking[self._value]
-        else:
-            rank = self.value_ranking[self._value]
-
-        return rank
+        return Card._ranks[self._code]
 
     def __lt__(self, to: Card) -> bool:
 
-        return self._rank() < to._rank()
+        if not isinstance(to, Card):
+            return NotImplemented
+
+        return Card._ranks[self._code] < Card._ranks[to._code]
+
+    def __eq__(self, to: object) -> bool:
+
+        if not isinstance(to, Card):
+            return NotImplemented
 
-    def __eq__(self, to: Card) -> bool:
+        return self._code == to._code
 
-        return self._rank() == to._rank()
+    def __hash__(self) -> int:
+
+        return self._code
 
     def __le__(self, to: Card) -> bool:
 
-        return self._rank() > to._rank()
+        if not isinstance(to, Card):
+            return NotImplemented
+
+        return Card._ranks[self._code] <= Card._ranks[to._code]
+
+    def __gt__(self, to: Card) -> bool:
+
+        if not isinstance(to, Card):
+            return NotImplemented
+
+        return Card._ranks[self._code] > Card._ranks[to._code]
+
+    def __ge__(self, to: Card) -> bool:
+
+        if not isinstance(to, Card):
+            return NotImplemented
+
+        return Card._ranks[self._code] >= Card._ranks[to._code]
 
     def __repr__(self):
 
@@ -142,3 +307,241 @@ class Card:
         unicode_value = base + suit_offset + value_offset
 
         return chr(unicode_value)
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __delattr__(self, name):
+
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __reduce__(self):
+
+        return Card, (self._suit, self._value)
+
+
+# Build the 52 interned cards once, in code order
+for _suit in Suit:
+    for _value in Value:
+        Card._by_code.append(Card(_suit, _value))
+
+del _suit, _value
+
+
+class RankingPolicy:
+
+    """
+    An immutable ranking of the cards, compiled once into a table of 52
+    integer sort keys indexed by card code. Unlike the class-level ranking of
+    :class:`Card`, policies are not shared state: decks and games can each
+    carry their own, so tables with different rules (ace-low, trump suits,
+    bridge suit order, ...) can run side by side in one process or thread.
+
+    :param suit_ranking: A mapping of Suit enums to their ranks, None for the
+                         default ranking.
+    :type suit_ranking: Optional[Mapping[Suit, int]]
+    :param value_ranking: A mapping of Value enums to their ranks, None for
+                          the default ranking (ace high).
+    :type value_ranking: Optional[Mapping[Value, int]]
+    :param suit_ordered: Flag to determine if suit is considered in ranking.
+    :type suit_ordered: bool
+
+    :Example:
+        >>> ace_low = RankingPolicy(
+        ...     value_ranking={value: value.value for value in Value}
+        ... )
+        >>> ace_low.key(Card(Suit.SPADES, Value.ACE))
+        1
+        >>> ace_low.max([Card(Suit.SPADES, Value.ACE),
+        ...              Card(Suit.SPADES, Value.TWO)])
+        Card(Suit.SPADES, Value.TWO)
+    """
+
+    __slots__ = (
+        '_suit_ranking', '_value_ranking', '_suit_ordered', '_ranks',
+        '_sort_buckets'
+    )
+
+    def __init__(
+        self, suit_ranking: Optional[Mapping[Suit, int]] = None,
+        value_ranking: Optional[Mapping[Value, int]] = None,
+        suit_ordered: bool = False
+    ):
+
+        if suit_ranking is None:
+            suit_ranking = DEFAULT_SUIT_RANKING
+        if value_ranking is None:
+            value_ranking = DEFAULT_VALUE_RANKING
+
+        ranks = []
+        for suit in Suit:
+            for value in Value:
+                if suit_ordered:
+                    rank = suit_ranking[suit] * len(value_ranking) + \
+                           value_ranking[value]
+                else:
+                    rank = value_ranking[value]
+                ranks.append(rank)
+
+        set_attribute = object.__setattr__
+        set_attribute(self, '_suit_ranking', MappingProxyType(
+            dict(suit_ranking)
+        ))
+        set_attribute(self, '_value_ranking', MappingProxyType(
+            dict(value_ranking)
+        ))
+        set_attribute(self, '_suit_ordered', bool(suit_ordered))
+        set_attribute(self, '_ranks', tuple(ranks))
+
+        # For bucket sorts: for each sort key, in ascending order, the codes
+        # of all the cards with a different key, for bytes.translate to drop
+        set_attribute(self, '_sort_buckets', tuple(
+            bytes(code for code, rank in enumerate(ranks) if rank != key)
+            for key in sorted(set(ranks))
+        ))
+
+    @property
+    def suit_ranking(self) -> Mapping[Suit, int]:
+
+        """
+        Gets the read-only mapping of Suit enums to their ranks.
+        """
+
+        return self._suit_ranking
+
+    @property
+    def value_ranking(self) -> Mapping[Value, int]:
+
+        """
+        Gets the read-only mapping of Value enums to their ranks.
+        """
+
+        return self._value_ranking
+
+    @property
+    def suit_ordered(self) -> bool:
+
+        """
+        Checks if suit is considered in ranking.
+        """
+
+        return self._suit_ordered
+
+    @property
+    def ranks(self) -> tuple:
+
+        """
+        Gets the sort keys of the cards, indexed by card code.
+
+        :return: The 52 sort keys.
+        :rtype: tuple
+        """
+
+        return self._ranks
+
+    def replace(self, **changes) -> RankingPolicy:
+
+        """
+        Creates a new policy with some of the rules changed.
+
+        :param changes: New values for ``suit_ranking``, ``value_ranking``
+                        or ``suit_ordered``.
+        :return: The new policy.
+
+        :Example:
+            >>> bridge = RankingPolicy().replace(suit_ordered=True)
+            >>> bridge.suit_ordered
+            True
+        """
+
+        rules = {
+            'suit_ranking': self._suit_ranking,
+            'value_ranking': self._value_ranking,
+            'suit_ordered': self._suit_ordered
+        }
+        rules.update(changes)
+
+        return RankingPolicy(**rules)
+
+    def key(self, card: Card) -> int:
+
+        """
+        Gets the sort key of a card under this policy.
+
+        :param card: The card to rank.
+        :return: The rank of the card.
+        :rtype: int
+        """
+
+        return self._ranks[card._code]
+
+    def compare(self, a: Card, b: Card) -> int:
+
+        """
+        Compares two cards under this policy.
+
+        :param a: The first card.
+        :param b: The second card.
+        :return: A negative number if a ranks lower than b, zero if they rank
+                 the same, a positive number otherwise.
+        :rtype: int
+        """
+
+        return self._ranks[a._code] - self._ranks[b._code]
+
+    def sorted(
+        self, cards: Iterable[Card], reverse: bool = False
+    ) -> List[Card]:
+
+        """
+        Sorts cards under this policy. Cards of equal rank keep their
+        relative order.
+
+        :param cards: The cards to sort.
+        :param reverse: Whether to put the highest ranked cards first.
+        :return: The sorted cards.
+        """
+
+        return sorted(cards, key=self.key, reverse=reverse)
+
+    def max(self, cards: Iterable[Card]) -> Card:
+
+        """
+        Gets the highest ranked card under this policy.
+        """
+
+        return max(cards, key=self.key)
+
+    def min(self, cards: Iterable[Card]) -> Card:
+
+        """
+        Gets the lowest ranked card under this policy.
+        """
+
+        return min(cards, key=self.key)
+
+    def __eq__(self, other: object) -> bool:
+
+        if not isinstance(other, RankingPolicy):
+            return NotImplemented
+
+        return self._ranks == other._ranks
+
+    def __hash__(self) -> int:
+
+        return hash(self._ranks)
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __reduce__(self):
+
+        return RankingPolicy, (
+            dict(self._suit_ranking), dict(self._value_ranking),
+            self._suit_ordered
+        )
+
+
+Card._compile_ranking()
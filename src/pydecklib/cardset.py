@@ -0,0 +1,262 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional
+
+from src.pydecklib.card import Card
+from src.pydecklib.deck import Deck
+
+_FULL_MASK = (1 << 52) - 1
+
+
+class CardSet:
+
+    """
+    Represents a set of distinct cards as a single 52-bit integer, where bit i
+    is set if the card with code i is in the set. Adding, removing and
+    testing a card are O(1) bit operations, set algebra is one integer
+    operation, and the size is a popcount. Iteration yields the cards in
+    canonical order (by card code).
+
+    :param cards: Cards to put in the set.
+    :type cards: Optional[Iterable[Card]]
+
+    :Example:
+        >>> hand = CardSet([Card(Suit.SPADES, Value.ACE)])
+        >>> Card(Suit.SPADES, Value.ACE) in hand
+        True
+        >>> len(CardSet.from_deck(Deck()) - hand)
+        51
+    """
+
+    __slots__ = ('_mask',)
+
+    def __init__(self, cards: Optional[Iterable[Card]] = None):
+
+        mask = 0
+
+        if cards is not None:
+            for card in cards:
+                mask |= 1 << card.code
+
+        self._mask = mask
+
+    @classmethod
+    def from_mask(cls, mask: int) -> CardSet:
+
+        """
+        Creates a set from its bitmask.
+
+        :param mask: The bitmask, bit i standing for the card with code i.
+        :return: A new set.
+        """
+
+        if not 0 <= mask <= _FULL_MASK:
+            raise ValueError(f"Not a 52-bit card mask: {mask:#x}")
+
+        card_set = cls()
+        card_set._mask = mask
+
+        return card_set
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[int]) -> CardSet:
+
+        """
+        Creates a set from integer card codes.
+
+        :param codes: The codes of the cards, between 0 and 51.
+        :return: A new set.
+
+        :Example:
+            >>> len(CardSet.from_codes(range(13)))
+            13
+        """
+
+        mask = 0
+        for code in codes:
+            mask |= 1 << code
+
+        return cls.from_mask(mask)
+
+    @classmethod
+    def from_deck(cls, deck: Deck) -> CardSet:
+
+        """
+        Creates the set of the cards of a deck, ignoring duplicates, from
+        the mask of the deck.
+
+        :param deck: The deck to read.
+        :return: A new set.
+        """
+
+        return cls.from_mask(deck.mask)
+
+    @classmethod
+    def full(cls) -> CardSet:
+
+        """
+        Creates the set of all 52 cards.
+
+        :return: A new set.
+        """
+
+        return cls.from_mask(_FULL_MASK)
+
+    @property
+    def mask(self) -> int:
+
+        """
+        Gets the bitmask of the set.
+
+        :return: The bitmask, bit i standing for the card with code i.
+        :rtype: int
+        """
+
+        return self._mask
+
+    @property
+    def codes(self) -> bytes:
+
+        """
+        Gets the integer codes of the cards, in ascending order.
+
+        :return: The card codes, one byte per card.
+        :rtype: bytes
+        """
+
+        codes = bytearray()
+        mask = self._mask
+
+        while mask:
+            low = mask & -mask
+            codes.append(low.bit_length() - 1)
+            mask ^= low
+
+        return bytes(codes)
+
+    def add(self, card: Card) -> None:
+
+        """
+        Adds a card to the set.
+
+        :param card: The card to add.
+        """
+
+        self._mask |= 1 << card.code
+
+    def remove(self, card: Card) -> None:
+
+        """
+        Removes a card from the set.
+
+        :param card: The card to remove.
+        :raises KeyError: If the card is not in the set.
+        """
+
+        bit = 1 << card.code
+        if not self._mask & bit:
+            raise KeyError(card)
+
+        self._mask ^= bit
+
+    def discard(self, card: Card) -> None:
+
+        """
+        Removes a card from the set if it is present.
+
+        :param card: The card to remove.
+        """
+
+        self._mask &= ~(1 << card.code)
+
+    def to_deck(self) -> Deck:
+
+        """
+        Creates a deck holding the cards of the set in canonical order.
+
+        :return: A new deck.
+        """
+
+        return Deck.from_codes(self.codes)
+
+    def copy(self) -> CardSet:
+
+        """
+        Creates an independent copy of the set.
+
+        :return: A new set.
+        """
+
+        return CardSet.from_mask(self._mask)
+
+    def __contains__(self, card: Card) -> bool:
+
+        return self._mask >> card.code & 1 == 1
+
+    def __len__(self) -> int:
+
+        return bin(self._mask).count('1')
+
+    def __iter__(self) -> Iterator[Card]:
+
+        return map(Card.from_code, self.codes)
+
+    def __or__(self, other: CardSet) -> CardSet:
+
+        return CardSet.from_mask(self._mask | other._mask)
+
+    def __and__(self, other: CardSet) -> CardSet:
+
+        return CardSet.from_mask(self._mask & other._mask)
+
+    def __sub__(self, other: CardSet) -> CardSet:
+
+        return CardSet.from_mask(self._mask & ~other._mask)
+
+    def __xor__(self, other: CardSet) -> CardSet:
+
+        return CardSet.from_mask(self._mask ^ other._mask)
+
+    def __invert__(self) -> CardSet:
+
+        return CardSet.from_mask(_FULL_MASK & ~self._mask)
+
+    def __ior__(self, other: CardSet) -> CardSet:
+
+        self._mask |= other._mask
+
+        return self
+
+    def __iand__(self, other: CardSet) -> CardSet:
+
+        self._mask &= other._mask
+
+        return self
+
+    def __isub__(self, other: CardSet) -> CardSet:
+
+        self._mask &= ~other._mask
+
+        return self
+
+    def __le__(self, other: CardSet) -> bool:
+
+        return self._mask & ~other._mask == 0
+
+    def __ge__(self, other: CardSet) -> bool:
+
+        return other._mask & ~self._mask == 0
+
+    def __eq__(self, other: object) -> bool:
+
+        if not isinstance(other, CardSet):
+            return NotImplemented
+
+        return self._mask == other._mask
+
+    def __repr__(self):
+
+        return f"CardSet({''.join(map(repr, self))})"
@@ -3,10 +3,61 @@
 
 from __future__ import annotations
 
-import random
-from typing import Optional, Generator, List, Iterator, Tuple
-
-from src.pydecklib.card import Card, Suit, Value
+import hashlib
+import pickle
+import struct
+from itertools import islice
+from typing import (
+    Any, Optional, Generator, List, Iterator, Tuple, Iterable, Union
+)
+
+from src.pydecklib.blocklist import BlockList
+from src.pydecklib.card import Card, RankingPolicy, Suit, Value
+from src.pydecklib.rng import (
+    NumpyRandom, derive_rng, dump_rng, load_rng, make_rng, spawn_rng
+)
+from src.pydecklib.template import STANDARD, DeckTemplate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Interned cards indexed by code
+_CARDS = Card._by_code
+_NO_CARDS = (0,) * len(_CARDS)
+
+# Buffer types holding the card codes, by storage mode
+_STORAGES = {'array': bytearray, 'blocked': BlockList}
+
+# Operations recorded in the journal of a deck
+_DRAW, _TAKE, _POP, _POP_AT, _SWAP_POP, _SLOT, _INSERT, _BUFFER, _SWAP, \
+    _LAZY = range(10)
+_DRAW_ENTRY = (_DRAW,)
+
+# Modes of the incremental hash of a deck
+_HASH_MODES = ('ordered', 'composition')
+
+# Zobrist keys of the card codes, and base of the polynomial ordered hash,
+# modulo 2**64. The base is odd, hence invertible.
+_HASH_MASK = (1 << 64) - 1
+_ZOBRIST_KEYS = tuple(
+    int.from_bytes(hashlib.blake2b(bytes([code])).digest()[:8], 'big')
+    for code in range(len(_CARDS))
+)
+_HASH_BASE = 0x9E3779B97F4A7C15
+_HASH_BASE_INVERSE = pow(_HASH_BASE, -1, 1 << 64)
+
+# Ends of the deck where a card is added or removed, for the ordered hash
+_TOP, _BOTTOM = range(2)
+
+# Header of the binary form of a deck: magic, format version, flags, value
+# mask, suit mask and copies of the template, and number of cards. The
+# codes of the cards follow, then the state of the generator.
+_HEADER = struct.Struct('<3sBBHBHI')
+_MAGIC = b'PDK'
+_VERSION = 1
+_BLOCKED, _COMPOSITION = 1, 2
 
 
 class Deck:
@@ -17,6 +68,47 @@ class Deck:
     be customized with a specific number of cards, shuffled with a seed, or
     overridden with a custom set of cards.
 
+    The cards are stored compactly as a ``bytearray`` of card codes (see
+    :attr:`Card.code`), one byte per card. ``Card`` objects are only looked up
+    when the deck is iterated or drawn from, and shuffling, slicing, equality
+    and copying all operate on the raw bytes.
+
+    Cards drawn from the top are not removed from the buffer: a head cursor
+    is moved past them instead, so top draws, bottom draws and counting the
+    cards are all O(1). The consumed prefix is dropped lazily, the next time
+    the whole deck is rewritten or compared.
+
+    Each deck owns its random number generator, so seeding one deck never
+    affects another deck or the global ``random`` module. The generator can
+    be a ``random.Random``, a NumPy ``Generator`` or any object following the
+    ``random.Random`` interface. Passing a ``seed`` to a method reseeds the
+    deck's own generator.
+
+    A deck can also carry its own :class:`RankingPolicy`, used by
+    :meth:`sort`, so decks following different rules can coexist.
+
+    Two storage modes are available. ``"array"`` (the default) keeps the
+    codes in one ``bytearray``: removing or inserting a card in the middle,
+    as :meth:`draw_random` and :meth:`add_card` do, moves every card after
+    it. ``"blocked"`` keeps them in a :class:`BlockList`, where these
+    operations cost O(log n) plus a small constant-size move. Moving bytes
+    is cheap, so the array stays faster up to a few hundred thousand cards;
+    the blocked mode is meant for larger buffers. Both modes keep the exact
+    order of the deck.
+
+    Backtracking searches can journal the changes made to a deck with
+    :meth:`checkpoint`, and undo them with :meth:`rollback`.
+
+    Decks are hashable, for transposition tables. The 64-bit hash of a deck
+    is a Zobrist-style hash, updated in O(1) as cards are drawn and added:
+    in ``"ordered"`` mode it depends on the order of the cards, in
+    ``"composition"`` mode only on which cards the deck holds. Changes in
+    the middle of the deck (and shuffles, in ordered mode) make the hash be
+    recomputed when next needed. A deck used as a dictionary key must not
+    be changed; :meth:`fork` it instead. In composition mode, decks holding
+    the same cards in any order compare equal. Decks with different hash
+    modes never compare equal, since their hashes differ.
+
     :param initialise: Flag to initialise the deck with standard cards.
     :type initialise: bool
     :param shuffle: Flag to shuffle the deck upon initialisation.
@@ -27,6 +119,19 @@ class Deck:
     :type override: Optional[Tuple[Card]]
     :param seed: Seed for shuffling operations.
     :type seed: Optional[int]
+    :param rng: Random number generator owned by the deck, None to create a
+                ``random.Random`` when first needed.
+    :type rng: Optional[Any]
+    :param ranking: Ranking policy of the deck, None for the default ranking
+                    of :class:`Card`.
+    :type ranking: Optional[RankingPolicy]
+    :param storage: Storage mode of the deck, ``"array"`` or ``"blocked"``.
+    :type storage: str
+    :param hash_mode: Hash mode of the deck, ``"ordered"`` or
+                      ``"composition"``.
+    :type hash_mode: str
+    :param template: Variant of the deck, None for the standard 52 cards.
+    :type template: Optional[DeckTemplate]
 
     :Example:
         >>> deck = Deck(shuffle=True)  # Create and shuffle a deck
@@ -46,16 +151,63 @@ class Deck:
     def __init__(
         self, initialise: bool = True, shuffle: bool = False,
         n: Optional[int] = None, override: Optional[Tuple[Card], ...] = None,
-        seed: Optional[int] = None
+        seed: Optional[int] = None, rng: Any = None,
+        ranking: Optional[RankingPolicy] = None, storage: str = 'array',
+        hash_mode: str = 'ordered', template: Optional[DeckTemplate] = None
     ):
 
-        self._deck: list = list()
+        if storage not in _STORAGES:
+            raise ValueError(f"Unknown storage mode: {storage!r}")
+        if hash_mode not in _HASH_MODES:
+            raise ValueError(f"Unknown hash mode: {hash_mode!r}")
+
+        self._storage = storage
+        self._template = template if template is not None else STANDARD
+        self._deck: bytearray = self._buffer()
+        self._head: int = 0
+        self._shared: Optional[bytearray] = None
+        self._journal: Optional[List[tuple]] = None
+        self._hash_mode = hash_mode
+        self._hash: Optional[int] = None
+        self._power = 1
+        self._counts: Optional[Tuple[List[int], List[int], List[int]]] = None
+        self._mask = 0
+        self._rng = None
+        self._forks = 0
+        self._ranking = ranking
+
+        if rng is not None or seed:
+            self._rng = make_rng(rng, seed or None)
 
         if initialise:
             self.initialise(shuffle, n, seed)
 
         if override is not None:
-            self._deck = list(override)
+            self._deck = self._buffer(card.code for card in override)
+            self._head = 0
+
+    @classmethod
+    def from_codes(
+        cls, codes: Iterable[int], storage: str = 'array'
+    ) -> Deck:
+
+        """
+        Creates a deck from integer card codes, top card first.
+
+        :param codes: The codes of the cards, between 0 and 51.
+        :param storage: Storage mode of the deck.
+        :return: A new deck holding these cards.
+
+        :Example:
+            >>> deck = Deck.from_codes([0, 1, 2])
+            >>> deck.cards_count
+            3
+        """
+
+        deck = cls(initialise=False, storage=storage)
+        deck._deck = deck._buffer(codes)
+
+        return deck
 
     @property
     def empty(self) -> bool:
@@ -72,7 +224,7 @@ class Deck:
             False
         """
 
-        return len(self._deck) == 0
+        return len(self._deck) == self._head
 
     @property
     def cards_count(self) -> int:
@@ -89,7 +241,189 @@ class Deck:
             52
         """
 
-        return len(self._deck)
+        return len(self._deck) - self._head
+
+    @property
+    def codes(self) -> bytes:
+
+        """
+        Gets the integer codes of the cards in the deck, top card first.
+
+        :return: The card codes, one byte per card.
+        :rtype: bytes
+
+        :Example:
+            >>> deck = Deck(n=3)
+            >>> list(deck.codes)
+            [0, 1, 2]
+        """
+
+        return bytes(self._deck[self._head:])
+
+    @property
+    def storage(self) -> str:
+
+        """
+        Gets the storage mode of the deck.
+
+        :return: ``"array"`` or ``"blocked"``.
+        :rtype: str
+        """
+
+        return self._storage
+
+    @property
+    def template(self) -> DeckTemplate:
+
+        """
+        Gets the variant of the deck, used by :meth:`initialise`.
+
+        :return: The template of the deck.
+        :rtype: DeckTemplate
+        """
+
+        return self._template
+
+    @property
+    def hash_mode(self) -> str:
+
+        """
+        Gets the hash mode of the deck.
+
+        :return: ``"ordered"`` or ``"composition"``.
+        :rtype: str
+        """
+
+        return self._hash_mode
+
+    @property
+    def zobrist(self) -> int:
+
+        """
+        Gets the 64-bit hash of the deck, following its hash mode.
+
+        :return: The hash of the deck.
+        :rtype: int
+
+        :Example:
+            >>> deck = Deck(hash_mode="composition")
+            >>> deck.shuffle()
+            >>> deck.zobrist == Deck(hash_mode="composition").zobrist
+            True
+        """
+
+        if self._hash is None:
+            self._compute_hash()
+
+        return self._hash
+
+    @property
+    def mask(self) -> int:
+
+        """
+        Gets the 52-bit mask of the cards present in the deck, in O(1) once
+        the counters of the deck are built. Checking whether a card is in the
+        deck (``card in deck``) reads the mask.
+
+        :return: The mask, bit i being set if the card with code i is in the
+                 deck.
+        :rtype: int
+        """
+
+        if self._counts is None:
+            self._compute_counts()
+
+        return self._mask
+
+    def remaining(
+        self, value: Optional[Value] = None, suit: Optional[Suit] = None
+    ) -> int:
+
+        """
+        Counts the cards left in the deck of a value, of a suit, or of both.
+        The counters are built by the first call, then kept up to date in
+        O(1) by every change to the deck.
+
+        :param value: The value to count, None for any value.
+        :param suit: The suit to count, None for any suit.
+        :return: The number of matching cards left.
+        :rtype: int
+
+        :Example:
+            >>> deck = Deck(shuffle=True, seed=42)
+            >>> _ = list(deck.draw(10))
+            >>> deck.remaining(suit=Suit.SPADES) + sum(
+            ...     deck.remaining(value=value, suit=Suit.HEARTS)
+            ...     for value in Value)
+            18
+        """
+
+        if self._counts is None:
+            self._compute_counts()
+
+        codes, values, suits = self._counts
+
+        if value is None and suit is None:
+            return self.cards_count
+        if suit is None:
+            return values[value.value - 1]
+        if value is None:
+            return suits[suit.value]
+
+        return codes[suit.value * 13 + value.value - 1]
+
+    @property
+    def ranking(self) -> RankingPolicy:
+
+        """
+        Gets the ranking policy of the deck.
+
+        :return: The deck's policy, or the default ranking of :class:`Card`.
+        :rtype: RankingPolicy
+        """
+
+        if self._ranking is None:
+            return Card.default_ranking()
+
+        return self._ranking
+
+    @property
+    def rng(self) -> Any:
+
+        """
+        Gets the random number generator owned by the deck.
+
+        :return: The generator used for shuffles and random draws.
+
+        :Example:
+            >>> deck = Deck(seed=42)
+            >>> deck.rng.randint(0, 51)
+            40
+        """
+
+        if self._rng is None:
+            self._rng = make_rng()
+
+        return self._rng
+
+    def spawn_rng(self, n: int = 1) -> List[Any]:
+
+        """
+        Derives independent child generators from the deck's generator, for
+        example to give reproducible streams to several tables.
+
+        :param n: Number of generators to create.
+        :return: The child generators.
+
+        :Example:
+            >>> deck = Deck(seed=42)
+            >>> tables = [Deck(shuffle=True, rng=child)
+            ...           for child in deck.spawn_rng(4)]
+            >>> len(tables)
+            4
+        """
+
+        return spawn_rng(self.rng, n)
 
     def initialise(
         self, shuffle: bool = False, n: Optional[int] = None,
@@ -97,8 +431,9 @@ class Deck:
     ) -> None:
 
         """
-        Initialises or reinitialises the deck. The deck can be shuffled, and a
-        specific number of cards can be selected.
+        Initialises or reinitialises the deck with the cards of its template,
+        with a single buffer copy. The deck can be shuffled, and a specific
+        number of cards can be selected.
 
         :param shuffle: Whether to shuffle the deck.
         :param n: Number of cards to keep in the deck.
@@ -111,17 +446,52 @@ class Deck:
             20
         """
 
-        self.clear()
-
-        for suit in Suit:
-            for value in Value:
-                self._deck.append(Card(suit, value))
+        self._set_buffer(self._buffer(self._template.codes))
 
         if shuffle:
             self.shuffle(seed)
 
         if n:
-            self._deck = self._deck[:n]
+            del self._deck[n:]
+
+        self._invalidate()
+
+    def reset(self, shuffle: bool = False, seed: Optional[int] = None) -> None:
+
+        """
+        Restores all the cards of the template of the deck, in order unless
+        shuffled. Unlike :meth:`initialise`, the cards are copied into the
+        current buffer and the counters are refilled in place, so resetting
+        a deck allocates no new storage. A new buffer is only made when the
+        current one is shared with a fork, is journaled, or is blocked.
+
+        :param shuffle: Whether to shuffle the deck.
+        :param seed: Seed for the shuffling operation.
+
+        :Example:
+            >>> deck = Deck(shuffle=True)
+            >>> _ = list(deck.draw(10))
+            >>> deck.reset()
+            >>> deck == Deck()
+            True
+        """
+
+        codes = self._initial_codes()
+
+        if self._deck is self._shared or self._journal is not None \
+                or not isinstance(self._deck, bytearray):
+            self._set_buffer(self._buffer(codes))
+        else:
+            self._deck[:] = codes
+            self._head = 0
+
+        self._hash = None
+
+        if shuffle:
+            self.shuffle(seed)
+
+        if self._counts is not None:
+            self._compute_counts()
 
     def clear(self) -> None:
 
@@ -135,7 +505,8 @@ class Deck:
             True
         """
 
-        self._deck = list()
+        self._set_buffer(self._buffer())
+        self._invalidate()
 
     def shuffle(self, seed: Optional[int] = None) -> None:
 
@@ -152,10 +523,51 @@ class Deck:
             Card(Suit.DIAMONDS, Value.SIX)
         """
 
-        if seed:
-            random.seed(seed)
+        if self._journal is not None:
+            # Shuffle a copy, to keep the current order for a rollback
+            self._set_buffer(self._buffer(self._deck[self._head:]))
+        else:
+            self._compact()
+
+        rng = self._get_rng(seed)
+
+        if isinstance(self._deck, bytearray):
+            rng.shuffle(self._deck)
+        else:
+            codes = self._deck[:]
+            rng.shuffle(codes)
+            self._deck[:] = codes
+
+        self._reorder()
+
+    def sort(self, reverse: bool = False) -> None:
+
+        """
+        Sorts the cards in the deck by rank, as defined by the ranking policy
+        of the deck. Cards of equal rank keep their relative order.
+
+        This is a bucket sort on the precomputed sort keys of the cards: each
+        bucket is extracted from the byte buffer in a single
+        ``bytes.translate`` call, without comparing cards.
+
+        :param reverse: Whether to put the highest ranked cards on top.
+
+        :Example:
+            >>> deck = Deck(shuffle=True)
+            >>> deck.sort()
+            >>> next(deck.draw()).value
+            <Value.TWO: 2>
+        """
 
-        random.shuffle(self._deck)
+        codes = self._deck[self._head:]
+        buckets = self.ranking._sort_buckets
+        if reverse:
+            buckets = reversed(buckets)
+
+        self._set_buffer(self._buffer(bytearray().join(
+            codes.translate(None, others) for others in buckets
+        )))
+        self._reorder()
 
     def draw(self, n: int = 1) -> Generator[Card, None, None]:
 
@@ -174,10 +586,74 @@ class Deck:
 
         for i in range(n):
 
-            if self.empty:
+            if self._head == len(self._deck):
                 break
 
-            yield self._deck.pop(0)
+            self._head += 1
+            code = self._deck[self._head - 1]
+            self._removed(code, _TOP)
+            if self._journal is not None:
+                self._journal.append(_DRAW_ENTRY)
+
+            yield _CARDS[code]
+
+    def deal(
+        self, players: int, cards_each: int, order: str = "round_robin",
+        as_array: bool = False
+    ) -> Any:
+
+        """
+        Deals the top cards of the deck to a number of players and removes
+        them from the deck, all at once.
+
+        :param players: Number of players to deal to.
+        :param cards_each: Number of cards dealt to each player.
+        :param order: ``"round_robin"`` to deal one card to each player in
+                      turn, ``"block"`` to deal each player's cards in a
+                      row.
+        :param as_array: Whether to return the card codes as a NumPy array.
+        :return: One tuple of cards per player, or a ``(players,
+                 cards_each)`` array of card codes.
+
+        :Example:
+            >>> deck = Deck()
+            >>> deck.deal(players=2, cards_each=2)
+            [(🂡, 🂣), (🂢, 🂤)]
+            >>> deck.cards_count
+            48
+        """
+
+        if players < 1 or cards_each < 1:
+            raise ValueError(
+                f"Cannot deal {cards_each} cards to {players} players"
+            )
+
+        total = players * cards_each
+        if total > self.cards_count:
+            raise ValueError(
+                f"Cannot deal {total} cards from a deck of {self.cards_count}"
+            )
+        if order not in ("round_robin", "block"):
+            raise ValueError(f"Unknown dealing order: {order!r}")
+        if as_array and np is None:
+            raise ImportError("deal with as_array=True requires numpy")
+
+        dealt = self._take(total)
+
+        if as_array:
+            codes = np.frombuffer(dealt, dtype=np.uint8)
+            if order == "round_robin":
+                return codes.reshape(cards_each, players).T.copy()
+            return codes.reshape(players, cards_each).copy()
+
+        if order == "round_robin":
+            hands = [dealt[i::players] for i in range(players)]
+        else:
+            hands = [
+                dealt[i:i + cards_each] for i in range(0, total, cards_each)
+            ]
+
+        return [tuple(map(_CARDS.__getitem__, hand)) for hand in hands]
 
     def draw_bottom(self, n: int = 1) -> Generator[Card, None, None]:
 
@@ -196,20 +672,33 @@ class Deck:
 
         for i in range(n):
 
-            if self.empty:
+            if self._head == len(self._deck):
                 break
 
-            yield self._deck.pop(-1)
+            self._own()
+            code = self._deck.pop()
+            self._removed(code, _BOTTOM)
+            self._record(_POP, code)
+
+            yield _CARDS[code]
 
     def draw_random(
-        self, n: int = 1, seed: Optional[int] = None
+        self, n: int = 1, seed: Optional[int] = None,
+        preserve_order: bool = True
     ) -> Generator[Card, None, None]:
 
         """
         Draws 'n' random cards from the deck.
 
+        By default the remaining cards keep their order, which moves every
+        card below each drawn card. With ``preserve_order=False``, each drawn
+        card is replaced by the bottom card instead (swap-remove), in O(1):
+        the same cards are drawn, but the order of the remaining cards is
+        changed.
+
         :param n: Number of cards to draw randomly.
         :param seed: Seed for the random drawing.
+        :param preserve_order: Whether the remaining cards keep their order.
         :return: A generator yielding the drawn cards.
 
         :Example:
@@ -219,16 +708,30 @@ class Deck:
             2
         """
 
-        if seed:
-            random.seed(seed)
+        rng = self._get_rng(seed)
 
         for i in range(n):
 
             if self.empty:
                 break
 
-            index = random.randint(0, len(self._deck)-1)
-            yield self._deck.pop(index)
+            self._own()
+            index = self._head + rng.randint(0, self.cards_count-1)
+
+            if preserve_order:
+                code = self._deck.pop(index)
+                self._removed(code)
+                self._record(_POP_AT, index, code)
+
+            else:
+                code = self._deck[index]
+                self._deck[index] = self._deck[-1]
+                self._deck.pop()
+                self._removed(code)
+                self._reorder()
+                self._record(_SWAP_POP, index, code)
+
+            yield _CARDS[code]
 
     def add_card(
         self, card: Card, position: Optional[int] = None,
@@ -240,7 +743,8 @@ class Deck:
         By default, a random position is used.
 
         :param card: The card to add to the deck.
-        :param position: Position to insert the card (None for random).
+        :param position: Position to insert the card (None for random),
+                         negative positions counting from the bottom.
         :param seed: Seed for determining random position.
 
         :Example:
@@ -250,23 +754,50 @@ class Deck:
             1
         """
 
-        if seed:
-            random.seed(seed)
+        count = self.cards_count
+        if not position:
+            position = self._get_rng(seed).randint(0, count)
+        elif position < 0:
+            # Count from the bottom and clamp, like list.insert
+            position = max(position + count, 0)
+        else:
+            position = min(position, count)
+
+        self._own()
 
-        if position:
-            self._deck.insert(position, card)
+        if position == 0 and self._head:
+            # Reuse the slot of the last card drawn from the top
+            self._head -= 1
+            self._record(_SLOT, self._deck[self._head])
+            self._deck[self._head] = card.code
+            self._added(card.code, _TOP)
 
         else:
-            self._deck.insert(random.randint(0, len(self._deck)), card)
+            index = self._head + position
+            self._deck.insert(index, card.code)
+            if position == 0:
+                self._added(card.code, _TOP)
+            elif index == len(self._deck) - 1:
+                self._added(card.code, _BOTTOM)
+            else:
+                self._added(card.code)
+            # The index the card actually landed at, for the rollback
+            self._record(_INSERT, index)
 
     def add_cards(
-        self, cards: List[Card], seed: Optional[int] = None
+        self, cards: Iterable[Card], seed: Optional[int] = None
     ) -> None:
 
         """
         Adds multiple cards to the deck at random positions.
 
-        :param cards: A list of cards to add to the deck.
+        The k final positions of the cards are drawn at once, as an ordered
+        sample of the n + k positions of the resulting deck, then the cards
+        are merged with the deck in a single O(n + k) pass. Every order of
+        the new cards among the old ones is equally likely, exactly as when
+        inserting the cards one after another at random positions.
+
+        :param cards: The cards to add to the deck.
         :param seed: Seed for determining random positions.
 
         :Example:
@@ -279,13 +810,790 @@ class Deck:
             2
         """
 
-        for card in cards:
-            self.add_card(card, seed=seed)
+        codes = bytes(card.code for card in cards)
+        if not codes:
+            return
+
+        deck = self._deck[self._head:]
+        size = len(deck) + len(codes)
+        for code in codes:
+            self._added(code)
+        positions = self._get_rng(seed).sample(range(size), len(codes))
+
+        if np is not None:
+            merged = np.empty(size, dtype=np.uint8)
+            new = np.zeros(size, dtype=bool)
+            new[positions] = True
+            merged[positions] = np.frombuffer(codes, dtype=np.uint8)
+            merged[~new] = np.frombuffer(bytes(deck), dtype=np.uint8)
+            self._set_buffer(self._buffer(merged.tobytes()))
+            return
+
+        merged = bytearray()
+        start = 0
+        for position, code in sorted(zip(positions, codes)):
+            # Copy the old cards up to the position of the next new card
+            end = start + position - len(merged)
+            merged += deck[start:end]
+            merged.append(code)
+            start = end
+
+        merged += deck[start:]
+        self._set_buffer(self._buffer(merged))
+
+    def copy(self) -> Deck:
+
+        """
+        Creates an independent copy of the deck.
+
+        :return: A new deck holding the same cards in the same order.
+
+        :Example:
+            >>> deck = Deck(shuffle=True)
+            >>> deck.copy() == deck
+            True
+        """
+
+        deck = Deck.from_codes(self._deck[self._head:], self._storage)
+        deck._ranking = self._ranking
+        deck._template = self._template
+        deck._hash_mode = self._hash_mode
+        deck._hash, deck._power = self._hash, self._power
+
+        return deck
+
+    def fork(self) -> Deck:
+
+        """
+        Creates a copy-on-write copy of the deck, in O(1). The fork and the
+        deck share the same buffer until one of them changes it: that one
+        then copies the cards it still holds. Drawing from the top only moves
+        the head cursor, so it never copies anything. The fork keeps the
+        ranking of the deck, and gets its own generator, derived from the
+        generator of the deck without advancing it: the results of the deck
+        do not depend on how many forks were explored.
+
+        :return: A new deck holding the same cards in the same order.
+
+        :Example:
+            >>> deck = Deck(shuffle=True)
+            >>> child = deck.fork()
+            >>> _ = list(child.draw(5))
+            >>> deck.cards_count, child.cards_count
+            (52, 47)
+        """
+
+        deck = object.__new__(type(self))
+        deck.__dict__.update(self.__dict__)
+        deck._shared = self._shared = self._deck
+        deck._journal = None
+        deck._forks = 0
+        if self._rng is not None:
+            deck._rng = derive_rng(self._rng, self._forks)
+            self._forks += 1
+        if self._counts is not None:
+            deck._counts = tuple(list(counts) for counts in self._counts)
+
+        return deck
+
+    def checkpoint(self) -> int:
+
+        """
+        Marks the current state of the deck, to come back to it later with
+        :meth:`rollback`. The first checkpoint starts journaling: from then
+        on, every change to the deck is recorded as a small tuple, and
+        shuffles keep the previous buffer instead of shuffling it in place.
+
+        :return: The checkpoint, to pass to :meth:`rollback`.
+        :rtype: int
+
+        :Example:
+            >>> deck = Deck()
+            >>> checkpoint = deck.checkpoint()
+            >>> _ = list(deck.draw(5))
+            >>> deck.shuffle()
+            >>> deck.rollback(checkpoint)
+            >>> deck == Deck()
+            True
+        """
+
+        if self._journal is None:
+            self._journal = []
+
+        return len(self._journal)
+
+    def rollback(self, checkpoint: int) -> None:
+
+        """
+        Undoes the changes made since a checkpoint, in O(1) per change for
+        the array storage. The generator of the deck is not rewound.
+        Checkpoints taken after this one become invalid.
+
+        :param checkpoint: A checkpoint returned by :meth:`checkpoint`.
+        :raises ValueError: If the checkpoint is unknown.
+        """
+
+        journal = self._journal
+        if journal is None or not 0 <= checkpoint <= len(journal):
+            raise ValueError(f"Unknown checkpoint: {checkpoint!r}")
+
+        while len(journal) > checkpoint:
+            self._undo(journal.pop())
+
+    def commit(self) -> None:
+
+        """
+        Stops journaling and forgets the recorded changes. All checkpoints
+        become invalid.
+        """
+
+        self._journal = None
+
+    def to_bytes(self, include_rng: bool = True) -> bytes:
+
+        """
+        Serializes the deck compactly: a 14-byte header, one byte per card,
+        then the state of the generator, so that the restored deck continues
+        the same random stream. The ranking policy and the journal are not
+        serialized. A shoe is serialized as a plain deck of its cards.
+
+        :param include_rng: Whether to serialize the generator.
+        :return: The binary form of the deck.
+        :rtype: bytes
+        :raises ValueError: If the generator cannot be serialized.
+
+        :Example:
+            >>> deck = Deck(shuffle=True, seed=42)
+            >>> len(deck.to_bytes(include_rng=False))
+            67
+            >>> Deck.from_bytes(deck.to_bytes()) == deck
+            True
+        """
+
+        codes = self.codes
+
+        return self._header(len(codes)) + codes + dump_rng(
+            self._rng if include_rng else None
+        )
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, ranking: Optional[RankingPolicy] = None
+    ) -> Deck:
+
+        """
+        Creates a deck from the binary form written by :meth:`to_bytes`.
+
+        :param data: The binary form of the deck.
+        :param ranking: Ranking policy of the deck.
+        :return: A new deck holding the serialized cards and generator.
+        :raises ValueError: If the data is not a serialized deck.
+        """
+
+        data = memoryview(data)
+        end = _HEADER.size + _read_header(data)[-1]
+        if len(data) <= end:
+            raise ValueError("Truncated deck data")
+
+        return _restore_deck(
+            data[:_HEADER.size], data[_HEADER.size:end],
+            load_rng(data[end:]), ranking
+        )
+
+    def __copy__(self) -> Deck:
+
+        return self.copy()
+
+    def __reduce_ex__(self, protocol: int):
+
+        # Subclasses such as Shoe carry more state: pickle their attributes
+        if type(self) is not Deck:
+            return super().__reduce_ex__(protocol)
+
+        if protocol >= 5 and self._storage == 'array':
+            # Hand out a view of the buffer instead of a copy, so that it
+            # can travel out-of-band. The buffer is then treated as shared,
+            # and copied before the deck next changes it.
+            self._shared = self._deck
+            codes = pickle.PickleBuffer(
+                memoryview(self._deck)[self._head:]
+            )
+        else:
+            codes = self.codes
+
+        return _restore_deck, (
+            self._header(self.cards_count), codes, self._rng, self._ranking
+        )
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Card, Deck]:
+
+        if isinstance(index, slice):
+            return Deck.from_codes(
+                self._deck[self._head:][index], self._storage
+            )
+
+        if index < 0:
+            index += self.cards_count
+        if not 0 <= index < self.cards_count:
+            raise IndexError("Deck index out of range")
+
+        return _CARDS[self._deck[self._head + index]]
+
+    def _buffer(self, codes: Iterable[int] = b'') -> bytearray:
+
+        """
+        Private method to create a buffer of card codes for the storage mode
+        of the deck.
+        """
+
+        return _STORAGES[self._storage](codes)
+
+    def _initial_codes(self) -> bytes:
+
+        """
+        Private method to get the codes of a full deck, as restored by
+        :meth:`reset`.
+        """
+
+        return self._template.codes
+
+    def _get_rng(self, seed: Optional[int] = None) -> Any:
+
+        """
+        Private method to get the deck's generator, reseeded if a seed is
+        given.
+        """
+
+        rng = self.rng
+        if seed:
+            rng.seed(seed)
+
+        return rng
+
+    def _take(self, n: int) -> bytes:
+
+        """
+        Private method to remove the top n cards of the deck, and return
+        their codes.
+        """
+
+        codes = bytes(self._deck[self._head:self._head + n])
+        self._head += n
+        self._record(_TAKE, n)
+        for code in codes:
+            self._removed(code, _TOP)
+
+        return codes
+
+    def _compact(self) -> None:
+
+        """
+        Private method to drop the cards already drawn from the top, so that
+        the buffer holds exactly the cards of the deck. A buffer shared with
+        a fork is copied instead.
+        """
+
+        if self._deck is self._shared or self._journal is not None:
+            if self._head or self._deck is self._shared:
+                self._set_buffer(self._buffer(self._deck[self._head:]))
+        elif self._head:
+            del self._deck[:self._head]
+            self._head = 0
+
+    def _set_buffer(self, deck: bytearray) -> None:
+
+        """
+        Private method to replace the buffer of the deck, keeping the current
+        one in the journal.
+        """
+
+        self._record(_BUFFER, self._deck, self._head)
+        self._deck = deck
+        self._head = 0
+
+    def _header(self, count: int) -> bytes:
+
+        """
+        Private method to pack the header of the binary form of the deck.
+        """
+
+        flags = _BLOCKED if self._storage == 'blocked' else 0
+        if self._hash_mode == 'composition':
+            flags |= _COMPOSITION
+
+        template = self._template
+
+        return _HEADER.pack(
+            _MAGIC, _VERSION, flags,
+            sum(1 << value.value - 1 for value in template.values),
+            sum(1 << suit.value for suit in template.suits),
+            template.copies, count
+        )
+
+    def _record(self, *entry: Any) -> None:
+
+        """
+        Private method to record a change in the journal, if journaling.
+        """
+
+        if self._journal is not None:
+            self._journal.append(entry)
+
+    def _undo(self, entry: tuple) -> None:
+
+        """
+        Private method to undo one change recorded in the journal.
+        """
+
+        operation = entry[0]
+        deck = self._deck
+
+        if operation not in (_DRAW, _TAKE, _BUFFER) \
+                and deck is self._shared:
+            # The buffer was shared with a fork after this change
+            deck = self._deck = self._buffer(deck)
+
+        if operation == _DRAW:
+            self._head -= 1
+            self._added(deck[self._head], _TOP)
+        elif operation == _TAKE:
+            for _ in range(entry[1]):
+                self._head -= 1
+                self._added(deck[self._head], _TOP)
+        elif operation == _POP:
+            deck.append(entry[1])
+            self._added(entry[1], _BOTTOM)
+        elif operation == _POP_AT:
+            deck.insert(entry[1], entry[2])
+            self._added(entry[2])
+        elif operation == _SWAP_POP:
+            if entry[1] < len(deck):
+                deck.append(deck[entry[1]])
+                deck[entry[1]] = entry[2]
+            else:
+                deck.append(entry[2])
+            self._added(entry[2])
+            self._reorder()
+        elif operation == _SLOT:
+            self._removed(deck[self._head], _TOP)
+            deck[self._head] = entry[1]
+            self._head += 1
+        elif operation == _INSERT:
+            self._removed(deck[entry[1]])
+            del deck[entry[1]]
+        elif operation == _BUFFER:
+            # A fork may still hold the restored buffer: copy it before the
+            # next change
+            self._deck, self._head = entry[1], entry[2]
+            self._shared = self._deck
+            self._invalidate()
+        elif operation == _SWAP:
+            deck[entry[1]], deck[entry[2]] = deck[entry[2]], deck[entry[1]]
+            self._reorder()
+
+    def _compute_hash(self) -> None:
+
+        """
+        Private method to compute the hash of the deck from scratch. The
+        ordered hash is the polynomial sum of the keys of the cards, the top
+        card having the highest power of the base.
+        """
+
+        keys = _ZOBRIST_KEYS
+        codes = self._deck[self._head:]
+
+        if self._hash_mode == 'composition':
+            self._hash = sum(keys[code] for code in codes) & _HASH_MASK
+            return
+
+        value = 0
+        for code in codes:
+            value = (value * _HASH_BASE + keys[code]) & _HASH_MASK
+
+        self._hash = value
+        self._power = pow(_HASH_BASE, len(codes), 1 << 64)
+
+    def _compute_counts(self) -> None:
+
+        """
+        Private method to count the cards of the deck from scratch, by code,
+        value and suit, reusing the counters if they exist.
+        """
+
+        if self._counts is None:
+            self._counts = ([0] * len(_CARDS), [0] * 13, [0] * 4)
+
+        # Refill the existing counters, without allocating new ones
+        codes, values, suits = self._counts
+        codes[:] = _NO_CARDS
+        values[:] = _NO_CARDS[:13]
+        suits[:] = _NO_CARDS[:4]
+        mask = 0
+
+        for code in islice(self._deck, self._head, None):
+            codes[code] += 1
+            values[code % 13] += 1
+            suits[code // 13] += 1
+            mask |= 1 << code
+
+        self._mask = mask
+
+    def _added(self, code: int, end: Optional[int] = None) -> None:
+
+        """
+        Private method to update the counters and the hash of the deck after
+        adding a card at one end, or in the middle if no end is given.
+        """
+
+        if self._counts is not None:
+            codes, values, suits = self._counts
+            codes[code] += 1
+            values[code % 13] += 1
+            suits[code // 13] += 1
+            self._mask |= 1 << code
+
+        if self._hash is None:
+            return
+
+        key = _ZOBRIST_KEYS[code]
+
+        if self._hash_mode == 'composition':
+            self._hash = (self._hash + key) & _HASH_MASK
+        elif end == _TOP:
+            self._hash = (self._hash + key * self._power) & _HASH_MASK
+            self._power = self._power * _HASH_BASE & _HASH_MASK
+        elif end == _BOTTOM:
+            self._hash = (self._hash * _HASH_BASE + key) & _HASH_MASK
+            self._power = self._power * _HASH_BASE & _HASH_MASK
+        else:
+            self._hash = None
+
+    def _removed(self, code: int, end: Optional[int] = None) -> None:
+
+        """
+        Private method to update the counters and the hash of the deck after
+        removing a card from one end, or from the middle if no end is given.
+        """
+
+        if self._counts is not None:
+            codes, values, suits = self._counts
+            codes[code] -= 1
+            values[code % 13] -= 1
+            suits[code // 13] -= 1
+            if not codes[code]:
+                self._mask &= ~(1 << code)
+
+        if self._hash is None:
+            return
+
+        key = _ZOBRIST_KEYS[code]
+
+        if self._hash_mode == 'composition':
+            self._hash = (self._hash - key) & _HASH_MASK
+        elif end == _TOP:
+            self._power = self._power * _HASH_BASE_INVERSE & _HASH_MASK
+            self._hash = (self._hash - key * self._power) & _HASH_MASK
+        elif end == _BOTTOM:
+            self._hash = (self._hash - key) * _HASH_BASE_INVERSE & _HASH_MASK
+            self._power = self._power * _HASH_BASE_INVERSE & _HASH_MASK
+        else:
+            self._hash = None
+
+    def _reorder(self) -> None:
+
+        """
+        Private method to drop an ordered hash after the cards of the deck
+        were reordered.
+        """
+
+        if self._hash_mode == 'ordered':
+            self._hash = None
+
+    def _invalidate(self) -> None:
+
+        """
+        Private method to drop the counters and the hash after a bulk change
+        of the cards of the deck. They are recomputed when next needed.
+        """
+
+        self._counts = None
+        self._hash = None
+
+    def _own(self) -> None:
+
+        """
+        Private method to copy the buffer before changing it, if it is shared
+        with a fork.
+        """
+
+        if self._deck is self._shared:
+            self._compact()
 
     def __iter__(self) -> Iterator[Card]:
 
-        return iter(self._deck)
+        return map(_CARDS.__getitem__, islice(self._deck, self._head, None))
+
+    def __contains__(self, card: object) -> bool:
+
+        if not isinstance(card, Card):
+            return False
+
+        return bool(self.mask >> card.code & 1)
+
+    def __eq__(self, other: object) -> bool:
+
+        if not isinstance(other, Deck):
+            return NotImplemented
+
+        if self.cards_count != other.cards_count \
+                or self._hash_mode != other._hash_mode:
+            return False
+
+        if self._hash is not None and other._hash is not None \
+                and self._hash != other._hash:
+            return False
+
+        if self._hash_mode == 'composition':
+            return sorted(self._deck[self._head:]) \
+                == sorted(other._deck[other._head:])
+
+        return self._deck[self._head:] == other._deck[other._head:]
+
+    def __hash__(self) -> int:
+
+        return self.zobrist
+
+
+def _read_header(header: bytes) -> Tuple[int, int, int, int, int]:
+
+    """
+    Private function to unpack the header of the binary form of a deck,
+    into the flags, the value and suit masks, the copies and the count.
+    """
+
+    if len(header) < _HEADER.size:
+        raise ValueError("Truncated deck data")
+
+    magic, version, *fields = _HEADER.unpack_from(header)
+    if magic != _MAGIC:
+        raise ValueError("Not a serialized deck")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported deck format version: {version}")
+
+    return tuple(fields)
+
+
+def _restore_deck(
+    header: bytes, codes: Any, rng: Any,
+    ranking: Optional[RankingPolicy]
+) -> Deck:
+
+    """
+    Private function to rebuild a deck from its header, its card codes and
+    its generator, for :meth:`Deck.from_bytes` and unpickling. A
+    ``bytearray`` of codes is adopted as the buffer of the deck without a
+    copy.
+    """
+
+    flags, values, suits, copies, _ = _read_header(header)
+
+    deck = Deck(
+        initialise=False, ranking=ranking,
+        storage='blocked' if flags & _BLOCKED else 'array',
+        hash_mode='composition' if flags & _COMPOSITION else 'ordered',
+        template=DeckTemplate(
+            values=[value for value in Value
+                    if values >> value.value - 1 & 1],
+            suits=[suit for suit in Suit if suits >> suit.value & 1],
+            copies=copies
+        )
+    )
+    deck._rng = rng
+
+    if isinstance(codes, bytearray) and deck._storage == 'array':
+        deck._deck = codes
+    else:
+        deck._deck = deck._buffer(memoryview(codes))
+
+    return deck
+
+
+class DeckBatch:
+
+    """
+    Represents N decks at once as an ``(N, cards)`` matrix of card codes, to
+    shuffle and deal many decks with a few vectorized NumPy calls instead of
+    one Python call per deck and per card. Requires NumPy.
+
+    Like :class:`Deck`, the batch keeps a head cursor: dealing moves it
+    forward on every row at once and the dealt columns are not copied.
+
+    :param n: Number of decks in the batch.
+    :type n: int
+    :param shuffle: Flag to shuffle the decks upon initialisation.
+    :type shuffle: bool
+    :param seed: Seed for shuffling operations.
+    :type seed: Optional[int]
+    :param rng: NumPy generator owned by the batch, None to create one.
+    :type rng: Optional[numpy.random.Generator]
+    :param template: Variant of the decks, None for the standard 52 cards.
+    :type template: Optional[DeckTemplate]
+
+    :Example:
+        >>> batch = DeckBatch(1000, shuffle=True, seed=42)
+        >>> hands = batch.deal(players=4, cards_each=2)
+        >>> hands.shape
+        (1000, 4, 2)
+        >>> batch[0].cards_count
+        44
+    """
+
+    def __init__(
+        self, n: int, shuffle: bool = False, seed: Optional[int] = None,
+        rng: Any = None, template: Optional[DeckTemplate] = None
+    ):
+
+        if np is None:
+            raise ImportError("DeckBatch requires numpy")
+
+        if template is None:
+            template = STANDARD
+
+        if isinstance(rng, NumpyRandom):
+            rng = rng.generator
+
+        self._rng = rng if rng is not None else np.random.default_rng(seed)
+        self._codes = np.tile(
+            np.frombuffer(template.codes, dtype=np.uint8), (n, 1)
+        )
+        self._head = 0
+
+        if shuffle:
+            self.shuffle()
+
+    @classmethod
+    def from_codes(cls, codes: Any, rng: Any = None) -> DeckBatch:
+
+        """
+        Creates a batch from a matrix of card codes, one deck per row, top
+        card first.
+
+        :param codes: A 2D array of card codes.
+        :param rng: NumPy generator owned by the batch, None to create one.
+        :return: A new batch holding these decks.
+        """
+
+        batch = cls(0, rng=rng)
+        batch._codes = np.ascontiguousarray(codes, dtype=np.uint8)
+
+        return batch
+
+    @property
+    def codes(self) -> Any:
+
+        """
+        Gets the card codes of the decks, one row per deck, top card first.
+
+        :return: A read-only ``(N, cards_count)`` uint8 view.
+        :rtype: numpy.ndarray
+        """
+
+        view = self._codes[:, self._head:]
+        view.flags.writeable = False
+
+        return view
+
+    @property
+    def cards_count(self) -> int:
+
+        """
+        Counts the number of cards remaining in each deck.
+
+        :return: The number of cards per deck.
+        :rtype: int
+        """
+
+        return self._codes.shape[1] - self._head
+
+    def shuffle(self, seed: Optional[int] = None) -> None:
+
+        """
+        Shuffles every deck of the batch independently, in one call.
+
+        :param seed: Seed for the random shuffle.
+
+        :Example:
+            >>> batch = DeckBatch(3)
+            >>> batch.shuffle(seed=42)
+        """
+
+        if seed:
+            self._rng = np.random.default_rng(seed)
+
+        self._codes = self._rng.permuted(self._codes[:, self._head:], axis=1)
+        self._head = 0
+
+    def deal(
+        self, players: int, cards_each: int, order: str = "round_robin"
+    ) -> Any:
+
+        """
+        Deals the top cards of every deck to a number of players and removes
+        them from the decks.
+
+        :param players: Number of players to deal to.
+        :param cards_each: Number of cards dealt to each player.
+        :param order: ``"round_robin"`` to deal one card to each player in
+                      turn, ``"block"`` to deal each player's cards in a
+                      row.
+        :return: A ``(N, players, cards_each)`` array of card codes.
+
+        :Example:
+            >>> batch = DeckBatch(2)
+            >>> batch.deal(players=2, cards_each=2, order="block")[0]
+            array([[0, 1],
+                   [2, 3]], dtype=uint8)
+        """
+
+        if players < 1 or cards_each < 1:
+            raise ValueError(
+                f"Cannot deal {cards_each} cards to {players} players"
+            )
+
+        total = players * cards_each
+        if total > self.cards_count:
+            raise ValueError(
+                f"Cannot deal {total} cards from decks of {self.cards_count}"
+            )
+        if order not in ("round_robin", "block"):
+            raise ValueError(f"Unknown dealing order: {order!r}")
+
+        dealt = self._codes[:, self._head:self._head + total]
+
+        if order == "round_robin":
+            hands = dealt.reshape(-1, cards_each, players).transpose(0, 2, 1)
+        else:
+            hands = dealt.reshape(-1, players, cards_each)
+
+        self._head += total
+
+        return hands
+
+    def deck(self, index: int) -> Deck:
+
+        """
+        Converts one deck of the batch to a regular :class:`Deck`.
+
+        :param index: Index of the deck in the batch.
+        :return: A new deck holding the remaining cards of that row.
+        """
+
+        return Deck.from_codes(self._codes[index, self._head:].tobytes())
+
+    def __getitem__(self, index: int) -> Deck:
+
+        return self.deck(index)
 
-    def __eq__(self, other: Deck) -> bool:
+    def __len__(self) -> int:
 
-        return self._deck == other._deck
+        return self._codes.shape[0]
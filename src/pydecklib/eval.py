@@ -0,0 +1,332 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from enum import Enum
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from operator import index
+from typing import Any, Dict, Iterable, List, NamedTuple, Union
+
+from src.pydecklib.card import Card
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class HandCategory(Enum):
+    STRAIGHT_FLUSH = 0
+    FOUR_OF_A_KIND = 1
+    FULL_HOUSE = 2
+    FLUSH = 3
+    STRAIGHT = 4
+    THREE_OF_A_KIND = 5
+    TWO_PAIR = 6
+    ONE_PAIR = 7
+    HIGH_CARD = 8
+
+
+# Worst hand rank of each category, in category order
+_CATEGORY_BOUNDS = (10, 166, 322, 1599, 1609, 2467, 3325, 6185, 7462)
+
+# One prime per poker rank (two to ace), so that the product of the primes of
+# a hand identifies its ranks regardless of order
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Poker rank (0 for two, 12 for ace), prime and rank bit of each card code
+_RANK_OF_CODE = tuple((code % 13 - 1) % 13 for code in range(52))
+_PRIME_OF_CODE = tuple(_PRIMES[rank] for rank in _RANK_OF_CODE)
+_BIT_OF_CODE = tuple(1 << rank for rank in _RANK_OF_CODE)
+
+# Perfect hash keys of the poker ranks: the sums of the keys of the ranks of
+# 5, 6 or 7 cards never collide for a given number of cards
+_HASH_KEYS = (
+    0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181
+)
+
+# Rank bitmasks of the ten straights, from ace-high down to the wheel
+_STRAIGHTS = tuple(0x1F << (high - 4) for high in range(12, 3, -1)) + (0x100F,)
+
+
+class _Tables(NamedTuple):
+    flushes: List[int]
+    products: Dict[int, int]
+
+
+def _product(ranks: Iterable[int]) -> int:
+
+    """
+    Private function computing the prime product of poker ranks.
+    """
+
+    product = 1
+    for rank in ranks:
+        product *= _PRIMES[rank]
+
+    return product
+
+
+def _mask(ranks: Iterable[int]) -> int:
+
+    """
+    Private function computing the bitmask of poker ranks.
+    """
+
+    mask = 0
+    for rank in ranks:
+        mask |= 1 << rank
+
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _tables() -> _Tables:
+
+    """
+    Private function building the lookup tables, once. Hand ranks go from 1
+    (royal flush) to 7462 (seven-high), following the order of the 7462
+    distinct five-card poker hands.
+
+    The tables hold:
+
+    * ``flushes``: for every 13-bit mask of the ranks of five to seven cards
+      of one suit, the rank of the best flush or straight flush.
+    * ``products``: for every prime product of five to seven ranks, the rank
+      of the best hand those ranks make when there is no flush.
+    """
+
+    descending = range(12, -1, -1)
+    high_cards = [
+        ranks for ranks in combinations(descending, 5)
+        if _mask(ranks) not in _STRAIGHTS
+    ]
+
+    five_flushes = {}
+    five_products = {}
+    rank = 1
+
+    for straight in _STRAIGHTS:
+        five_flushes[straight] = rank
+        rank += 1
+
+    for quads in descending:
+        for kicker in descending:
+            if kicker != quads:
+                five_products[_product((quads,) * 4 + (kicker,))] = rank
+                rank += 1
+
+    for trips in descending:
+        for pair in descending:
+            if pair != trips:
+                five_products[_product((trips,) * 3 + (pair,) * 2)] = rank
+                rank += 1
+
+    for ranks in high_cards:
+        five_flushes[_mask(ranks)] = rank
+        rank += 1
+
+    for straight in _STRAIGHTS:
+        five_products[_product(
+            r for r in descending if straight >> r & 1
+        )] = rank
+        rank += 1
+
+    for trips in descending:
+        others = [r for r in descending if r != trips]
+        for kickers in combinations(others, 2):
+            five_products[_product((trips,) * 3 + kickers)] = rank
+            rank += 1
+
+    for high, low in combinations(descending, 2):
+        for kicker in descending:
+            if kicker not in (high, low):
+                five_products[_product((high, high, low, low, kicker))] = rank
+                rank += 1
+
+    for pair in descending:
+        others = [r for r in descending if r != pair]
+        for kickers in combinations(others, 3):
+            five_products[_product((pair, pair) + kickers)] = rank
+            rank += 1
+
+    for ranks in high_cards:
+        five_products[_product(ranks)] = rank
+        rank += 1
+
+    # Best flush or straight flush of any mask of five or more suited ranks
+    flushes = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count('1') < 5:
+            continue
+        for straight in _STRAIGHTS:
+            if mask & straight == straight:
+                flushes[mask] = five_flushes[straight]
+                break
+        else:
+            top = [r for r in descending if mask >> r & 1][:5]
+            flushes[mask] = five_flushes[_mask(top)]
+
+    # Best non-flush hand of any multiset of five to seven ranks: the best
+    # hand of n ranks is the best of the hands left when dropping one rank
+    products = dict(five_products)
+    for n in (6, 7):
+        for ranks in combinations_with_replacement(descending, n):
+            distinct = set(ranks)
+            if any(ranks.count(r) > 4 for r in distinct):
+                continue
+            product = _product(ranks)
+            products[product] = min(
+                products[product // _PRIMES[r]] for r in distinct
+            )
+
+    return _Tables(flushes, products)
+
+
+@lru_cache(maxsize=None)
+def _array_tables(k: int) -> tuple:
+
+    """
+    Private function building the NumPy lookup tables for hands of k cards,
+    once per k: the flush table, and a perfect hash table of the non-flush
+    hands. Each poker rank gets a key such that the sums of the keys of any
+    k ranks are all distinct, so the sum of the keys of a hand directly
+    indexes its rank. Flushes are found from the suit counts of the hand,
+    packed in one integer.
+    """
+
+    tables = _tables()
+    keys = np.array(_HASH_KEYS, dtype=np.int64)
+    size = 4 * _HASH_KEYS[12] + (k - 4) * _HASH_KEYS[11] + 1
+
+    hashes = np.zeros(size, dtype=np.int16)
+    for ranks in combinations_with_replacement(range(13), k):
+        if max(ranks.count(r) for r in ranks) <= 4:
+            key = sum(_HASH_KEYS[r] for r in ranks)
+            hashes[key] = tables.products[_product(ranks)]
+
+    # Suit counts of a hand packed four bits per suit, and the suit holding
+    # five or more cards (or -1) for every packed count
+    suit_count_of_code = np.left_shift(1, 4 * (np.arange(52) // 13))
+    packed = np.arange(1 << 16)
+    flush_suits = np.full(1 << 16, -1, dtype=np.int8)
+    for suit in range(4):
+        flush_suits[(packed >> 4 * suit & 0xF) >= 5] = suit
+
+    return (
+        np.array(tables.flushes, dtype=np.int16),
+        hashes,
+        keys[list(_RANK_OF_CODE)].astype(np.int32),
+        np.array(_BIT_OF_CODE, dtype=np.int32),
+        suit_count_of_code.astype(np.int32),
+        flush_suits
+    )
+
+
+def evaluate(cards: Iterable[Union[Card, int]]) -> int:
+
+    """
+    Evaluates a poker hand of 5, 6 or 7 cards, keeping its best five cards.
+    The lookup tables are built on the first call.
+
+    :param cards: The cards of the hand, as Card objects or integer codes.
+    :return: The rank of the hand, from 1 (royal flush) to 7462 (the worst
+             high card hand). Lower is better.
+    :rtype: int
+
+    :Example:
+        >>> evaluate([Card(Suit.SPADES, value) for value in (
+        ...     Value.TEN, Value.JACK, Value.QUEEN, Value.KING, Value.ACE
+        ... )])
+        1
+    """
+
+    tables = _tables()
+    product = 1
+    masks = [0, 0, 0, 0]
+    counts = [0, 0, 0, 0]
+    n = 0
+
+    for card in cards:
+        code = card.code if isinstance(card, Card) else index(card)
+        suit = code // 13
+        product *= _PRIME_OF_CODE[code]
+        masks[suit] |= _BIT_OF_CODE[code]
+        counts[suit] += 1
+        n += 1
+
+    if not 5 <= n <= 7:
+        raise ValueError(f"Expected 5 to 7 cards, got {n}")
+
+    for suit in range(4):
+        if counts[suit] >= 5:
+            return tables.flushes[masks[suit]]
+
+    return tables.products[product]
+
+
+def evaluate_batch(hands: Any) -> Any:
+
+    """
+    Evaluates many poker hands at once. Requires NumPy.
+
+    :param hands: An ``(N, k)`` array of card codes, one hand per row, with k
+                  between 5 and 7.
+    :return: An array of the N hand ranks, as returned by :func:`evaluate`.
+    :rtype: numpy.ndarray
+
+    :Example:
+        >>> batch = DeckBatch(100000, shuffle=True, seed=42)
+        >>> ranks = evaluate_batch(batch.deal(1, 7)[:, 0])
+        >>> ranks.shape
+        (100000,)
+    """
+
+    if np is None:
+        raise ImportError("evaluate_batch requires numpy")
+
+    hands = np.asarray(hands)
+    if hands.ndim != 2 or not 5 <= hands.shape[1] <= 7:
+        raise ValueError(
+            f"Expected an (N, k) array with k between 5 and 7, "
+            f"got shape {hands.shape}"
+        )
+
+    flushes, hashes, key_of_code, bit_of_code, suit_count_of_code, \
+        flush_suits = _array_tables(hands.shape[1])
+
+    # Suit counts packed four bits per suit: at most one suit can hold five or
+    # more of seven cards
+    suit_counts = suit_count_of_code[hands].sum(axis=1, dtype=np.int32)
+    flush_suit = flush_suits[suit_counts]
+    flush = flush_suit >= 0
+
+    result = hashes[key_of_code[hands].sum(axis=1)]
+
+    if flush.any():
+        flushed = hands[flush]
+        suited = flushed // 13 == flush_suit[flush, None]
+        masks = (bit_of_code[flushed] * suited).sum(axis=1)
+        result[flush] = flushes[masks]
+
+    return result
+
+
+def hand_category(rank: int) -> HandCategory:
+
+    """
+    Gets the category of a hand from its rank.
+
+    :param rank: The rank of the hand, as returned by :func:`evaluate`.
+    :return: The category of the hand.
+    :rtype: HandCategory
+
+    :Example:
+        >>> hand_category(1)
+        <HandCategory.STRAIGHT_FLUSH: 0>
+    """
+
+    return HandCategory(bisect_left(_CATEGORY_BOUNDS, rank))
@@ -0,0 +1,197 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import mmap
+from typing import Any, Generator, NamedTuple, Tuple
+
+from src.pydecklib.card import Card
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Interned cards indexed by code
+_CARDS = Card._by_code
+
+# Marks a byte that is not part of any card in the lookup tables
+_NONE = 0xFF
+
+
+def _table(entries: dict, default: int = _NONE) -> bytes:
+
+    """
+    Private function building a 256-entry lookup table indexed by byte.
+    """
+
+    return bytes(entries.get(byte, default) for byte in range(256))
+
+
+# Index of the value (0 for the ace) of the first character of a text
+# token such as "As" or "Td", and index of the suit of the second one
+_VALUE_TABLE = _table({
+    ord(char): i for i, char in enumerate('A23456789TJQK')
+})
+_SUIT_TABLE = _table({ord(char): i for i, char in enumerate('shdc')})
+
+# Bytes that cannot touch a text token: letters and digits
+_WORD_TABLE = _table({
+    byte: 1 for byte in range(128) if chr(byte).isalnum()
+}, default=0)
+
+# Card code of each glyph produced by Card.__repr__, indexed by the low
+# byte of its code point U+1F0xx. Glyphs of no card (backs, knights,
+# jokers) are left out.
+_GLYPH_TABLE = _table({
+    0xA0 + suit * 16 + value + (value > 10): suit * 13 + value - 1
+    for suit in range(4) for value in range(1, 14)
+})
+
+# Default size of the chunks of a file, in bytes
+_CHUNK_SIZE = 1 << 24
+
+
+class CardChunk(NamedTuple):
+    cards: Any
+    lines: Any
+
+
+def decode_cards(data: Any) -> Tuple[Any, Any]:
+
+    """
+    Finds and decodes all the cards written in a text, in bulk. Cards are
+    written either as two-character tokens, a value among ``A23456789TJQK``
+    followed by a suit among ``shdc`` (``"As"``, ``"Td"``), not touching any
+    letter or digit, or as the UTF-8 Unicode glyphs of
+    :meth:`Card.__repr__`. Each byte of the text goes through 256-entry
+    lookup tables, with a few vectorized NumPy operations for the whole
+    text. Requires NumPy.
+
+    Words of two letters spelling a card, such as "As" in "As expected",
+    are decoded as cards too.
+
+    :param data: The text, as bytes or any object exposing a buffer.
+    :return: A uint8 array of the card codes in order of appearance, and an
+             array of the byte offsets of the cards in the text.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+
+    :Example:
+        >>> codes, offsets = decode_cards(b'Dealt to Hero [As Td]')
+        >>> codes
+        array([ 0, 35], dtype=uint8)
+        >>> offsets
+        array([15, 18])
+    """
+
+    if np is None:
+        raise ImportError("decode_cards requires numpy")
+
+    text = np.frombuffer(data, dtype=np.uint8)
+
+    # Text tokens: a value byte followed by a suit byte, between two bytes
+    # that are not letters or digits
+    values = np.frombuffer(_VALUE_TABLE, dtype=np.uint8)[text[:-1]]
+    suits = np.frombuffer(_SUIT_TABLE, dtype=np.uint8)[text[1:]]
+    words = np.frombuffer(_WORD_TABLE, dtype=np.uint8)[text].astype(bool)
+    found = (values != _NONE) & (suits != _NONE)
+    found[1:] &= ~words[:-2]
+    found[:-1] &= ~words[2:]
+    tokens = np.flatnonzero(found)
+    token_codes = suits[tokens] * 13 + values[tokens]
+
+    # Glyphs: the four UTF-8 bytes F0 9F 82|83 xx of U+1F080 to U+1F0FF,
+    # the low byte of the code point being rebuilt from the last two
+    glyphs = np.flatnonzero(
+        (text[:-3] == 0xF0) & (text[1:-2] == 0x9F)
+        & ((text[2:-1] | 1) == 0x83)
+    )
+    low = 0x80 | (text[glyphs + 2] & 1) << 6 | text[glyphs + 3] & 0x3F
+    glyph_codes = np.frombuffer(_GLYPH_TABLE, dtype=np.uint8)[low]
+    valid = glyph_codes != _NONE
+
+    offsets = np.concatenate((tokens, glyphs[valid]))
+    order = np.argsort(offsets, kind='stable')
+
+    return (
+        np.concatenate((token_codes, glyph_codes[valid]))[order],
+        offsets[order]
+    )
+
+
+def read_cards(
+    path: str, chunk_size: int = _CHUNK_SIZE, as_cards: bool = False
+) -> Generator[CardChunk, None, None]:
+
+    """
+    Reads all the cards of a hand-history file, see :func:`decode_cards`
+    for the notations recognised. The file is memory-mapped and decoded a
+    chunk at a time, each chunk ending at the end of a line, so the memory
+    used stays bounded whatever the size of the file. Requires NumPy.
+
+    :param path: Path of the file.
+    :param chunk_size: Size of the chunks, in bytes. A chunk only exceeds
+                       it when a single line is longer.
+    :param as_cards: Whether to build :class:`Card` objects instead of
+                     returning the card codes.
+    :return: A generator yielding, for each chunk holding cards, the card
+             codes as a uint8 array (or a tuple of cards) and the 0-based
+             number of the line of each card.
+
+    :Example:
+        >>> for chunk in read_cards('hands.txt'):
+        ...     hands = np.split(chunk.cards, np.flatnonzero(
+        ...         np.diff(chunk.lines)) + 1)
+    """
+
+    if np is None:
+        raise ImportError("read_cards requires numpy")
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+
+    with open(path, 'rb') as file:
+        size = file.seek(0, 2)
+        if not size:
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            line = 0
+
+            while start < size:
+                stop = min(start + chunk_size, size)
+                if stop < size:
+                    end = data.rfind(b'\n', start, stop)
+                    if end < 0:
+                        end = data.find(b'\n', stop)
+                    stop = end + 1 if end >= 0 else size
+
+                codes, lines, newlines = _read_chunk(data, start, stop)
+                lines += line
+                line += newlines
+                start = stop
+
+                if len(codes):
+                    yield CardChunk(
+                        tuple(map(_CARDS.__getitem__, codes.tolist()))
+                        if as_cards else codes,
+                        lines
+                    )
+
+
+def _read_chunk(data: mmap.mmap, start: int, stop: int) -> tuple:
+
+    """
+    Private function decoding the cards of a chunk of a memory-mapped file,
+    with the line of each card within the chunk and the number of lines of
+    the chunk. No view of the mapping outlives the call, so the file can be
+    closed afterwards.
+    """
+
+    text = np.frombuffer(data, dtype=np.uint8, count=stop - start,
+                         offset=start)
+    codes, offsets = decode_cards(text)
+    newlines = np.flatnonzero(text == 0x0A)
+
+    return codes, np.searchsorted(newlines, offsets), len(newlines)
@@ -0,0 +1,243 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from math import comb
+from operator import index
+from typing import Any, Iterable, Tuple, Union
+
+from src.pydecklib.card import Card
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Binomial coefficients C(n, k) for all n and k up to 52
+_BINOMIALS = tuple(
+    tuple(comb(n, k) for k in range(53)) for n in range(53)
+)
+
+
+def _codes(cards: Iterable[Union[Card, int]]) -> list:
+
+    """
+    Private function converting cards or card codes to sorted codes.
+    """
+
+    return sorted(card.code if isinstance(card, Card) else index(card)
+                  for card in cards)
+
+
+def hand_count(k: int) -> int:
+
+    """
+    Counts the hands of k distinct cards, that is the number of indexes
+    used by :func:`rank_hand` for such hands.
+
+    :param k: Number of cards in a hand.
+    :return: The number of hands.
+    :rtype: int
+
+    :Example:
+        >>> hand_count(5)
+        2598960
+    """
+
+    return _BINOMIALS[52][k]
+
+
+def rank_hand(cards: Iterable[Union[Card, int]]) -> int:
+
+    """
+    Computes the index of a hand in the combinatorial number system: with
+    the codes of the hand sorted as c1 < c2 < ... < ck, the index is
+    C(c1, 1) + C(c2, 2) + ... + C(ck, k). Hands of k cards get every index
+    from 0 to ``hand_count(k) - 1`` exactly once (colex order), so tables
+    over all the hands can be flat arrays.
+
+    :param cards: The cards of the hand, as Card objects or integer codes.
+    :return: The index of the hand.
+    :rtype: int
+
+    :Example:
+        >>> rank_hand([0, 1, 2, 3, 4])
+        0
+        >>> rank_hand([47, 48, 49, 50, 51])
+        2598959
+    """
+
+    return sum(
+        _BINOMIALS[code][i] for i, code in enumerate(_codes(cards), 1)
+    )
+
+
+def unrank_hand(index: int, k: int) -> Tuple[int, ...]:
+
+    """
+    Computes the hand of k cards with a given index, the inverse of
+    :func:`rank_hand`.
+
+    :param index: The index of the hand.
+    :param k: Number of cards in the hand.
+    :return: The sorted codes of the cards of the hand.
+    :rtype: Tuple[int, ...]
+
+    :Example:
+        >>> unrank_hand(rank_hand([3, 12, 25]), 3)
+        (3, 12, 25)
+    """
+
+    if not 0 <= index < hand_count(k):
+        raise ValueError(f"No hand of {k} cards has index {index}")
+
+    codes = []
+    code = 52
+
+    for i in range(k, 0, -1):
+        # Largest code whose binomial fits in what is left of the index
+        code -= 1
+        while _BINOMIALS[code][i] > index:
+            code -= 1
+        codes.append(code)
+        index -= _BINOMIALS[code][i]
+
+    return tuple(reversed(codes))
+
+
+def canonicalize(cards: Iterable[Union[Card, int]]) -> Tuple[int, ...]:
+
+    """
+    Maps a hand to the representative of its class of suit-isomorphic
+    hands: the hands that only differ by a renaming of the suits. Within
+    each suit the hand is a set of values, kept as a 13-bit mask; the
+    representative gives the largest mask to spades, then hearts, diamonds
+    and clubs.
+
+    :param cards: The cards of the hand, as Card objects or integer codes.
+    :return: The sorted codes of the representative hand.
+    :rtype: Tuple[int, ...]
+
+    :Example:
+        >>> canonicalize([13, 40]) == canonicalize([0, 27])
+        True
+    """
+
+    masks = [0, 0, 0, 0]
+    for code in _codes(cards):
+        masks[code // 13] |= 1 << code % 13
+
+    masks.sort(reverse=True)
+
+    return tuple(
+        suit * 13 + value
+        for suit, mask in enumerate(masks)
+        for value in range(13) if mask >> value & 1
+    )
+
+
+def canonical_rank(cards: Iterable[Union[Card, int]]) -> int:
+
+    """
+    Computes the index of the representative of the class of a hand, so
+    that suit-isomorphic hands share one index.
+
+    :param cards: The cards of the hand, as Card objects or integer codes.
+    :return: The index of the representative hand.
+    :rtype: int
+    """
+
+    return rank_hand(canonicalize(cards))
+
+
+def rank_hands(hands: Any) -> Any:
+
+    """
+    Computes the indexes of many hands at once, as :func:`rank_hand`.
+    Requires NumPy.
+
+    :param hands: An ``(N, k)`` array of distinct card codes, one hand per
+                  row, in any order.
+    :return: An array of the N indexes.
+    :rtype: numpy.ndarray
+    """
+
+    if np is None:
+        raise ImportError("rank_hands requires numpy")
+
+    hands = np.sort(np.asarray(hands), axis=1)
+    binomials = np.array(_BINOMIALS, dtype=np.int64)
+
+    return binomials[hands, np.arange(1, hands.shape[1] + 1)].sum(axis=1)
+
+
+def unrank_hands(indexes: Any, k: int) -> Any:
+
+    """
+    Computes the hands of k cards of many indexes at once, as
+    :func:`unrank_hand`. Requires NumPy.
+
+    :param indexes: An array of N indexes.
+    :param k: Number of cards in a hand.
+    :return: An ``(N, k)`` uint8 array of sorted card codes.
+    :rtype: numpy.ndarray
+
+    :Example:
+        >>> unrank_hands(rank_hands([[2, 0, 1], [51, 50, 49]]), 3)
+        array([[ 0,  1,  2],
+               [49, 50, 51]], dtype=uint8)
+    """
+
+    if np is None:
+        raise ImportError("unrank_hands requires numpy")
+
+    indexes = np.array(indexes, dtype=np.int64)
+    if indexes.size and not (
+        (indexes >= 0).all() and (indexes < hand_count(k)).all()
+    ):
+        raise ValueError(f"Indexes out of range for hands of {k} cards")
+
+    binomials = np.array(_BINOMIALS, dtype=np.int64)
+    hands = np.empty((len(indexes), k), dtype=np.uint8)
+
+    for i in range(k, 0, -1):
+        # C(n, i) increases with n, so the largest code whose binomial
+        # fits is found by a binary search
+        code = np.searchsorted(binomials[:52, i], indexes, side='right') - 1
+        hands[:, i - 1] = code
+        indexes -= binomials[code, i]
+
+    return hands
+
+
+def canonicalize_hands(hands: Any) -> Any:
+
+    """
+    Maps many hands to the representatives of their classes, as
+    :func:`canonicalize`. Requires NumPy.
+
+    :param hands: An ``(N, k)`` array of distinct card codes, one hand per
+                  row.
+    :return: An ``(N, k)`` uint8 array of the sorted codes of the
+             representatives.
+    :rtype: numpy.ndarray
+    """
+
+    if np is None:
+        raise ImportError("canonicalize_hands requires numpy")
+
+    hands = np.asarray(hands)
+    n, k = hands.shape
+
+    bits = np.left_shift(1, np.arange(52) % 13)
+    suits = np.arange(52) // 13
+    masks = np.zeros((n, 4), dtype=np.int32)
+    for column in range(k):
+        codes = hands[:, column]
+        masks[np.arange(n), suits[codes]] |= bits[codes]
+
+    masks = -np.sort(-masks, axis=1)
+    present = (masks[:, :, None] >> np.arange(13) & 1).reshape(n, 52)
+
+    return np.nonzero(present)[1].reshape(n, k).astype(np.uint8)
@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+from src.pydecklib.card import RankingPolicy
+from src.pydecklib.deck import Deck
+from src.pydecklib.rng import make_rng
+from src.pydecklib.template import DeckTemplate
+
+
+class DeckPool:
+
+    """
+    Hands out reusable decks, so that simulations creating and discarding
+    decks all the time keep a flat memory use. A deck taken from the pool is
+    reset in place with :meth:`Deck.reset`; a deck given back is kept for
+    the next request instead of being collected.
+
+    All the decks of a pool share the generator of the pool, so a seeded
+    pool deals the same hands on every run.
+
+    :param size: Number of decks to create up front.
+    :type size: int
+    :param shuffle: Whether acquired decks are shuffled by default.
+    :type shuffle: bool
+    :param seed: Seed of the generator of the pool.
+    :type seed: Optional[int]
+    :param rng: Generator of the pool, None to create one.
+    :type rng: Optional[Any]
+    :param ranking: Ranking policy of the decks.
+    :type ranking: Optional[RankingPolicy]
+    :param template: Variant of the decks, None for the standard 52 cards.
+    :type template: Optional[DeckTemplate]
+
+    :Example:
+        >>> pool = DeckPool(size=4, seed=42)
+        >>> with pool.deck() as deck:
+        ...     hands = deck.deal(players=2, cards_each=2)
+        >>> len(pool)
+        4
+    """
+
+    def __init__(
+        self, size: int = 0, shuffle: bool = True,
+        seed: Optional[int] = None, rng: Any = None,
+        ranking: Optional[RankingPolicy] = None,
+        template: Optional[DeckTemplate] = None
+    ):
+
+        self._shuffle = shuffle
+        self._rng = make_rng(rng, seed)
+        self._ranking = ranking
+        self._template = template
+        self._free: List[Deck] = [self._create() for _ in range(size)]
+        self._free_ids = {id(deck) for deck in self._free}
+
+    def acquire(self, shuffle: Optional[bool] = None) -> Deck:
+
+        """
+        Takes a deck from the pool, creating one if none is free, and resets
+        it to a full deck.
+
+        :param shuffle: Whether to shuffle the deck, None for the default of
+                        the pool.
+        :return: A full deck.
+        """
+
+        if self._free:
+            deck = self._free.pop()
+            self._free_ids.remove(id(deck))
+        else:
+            deck = self._create()
+        deck.reset(self._shuffle if shuffle is None else shuffle)
+
+        return deck
+
+    def release(self, deck: Deck) -> None:
+
+        """
+        Gives a deck back to the pool. The deck must not be used afterwards.
+
+        :param deck: A deck acquired from this pool.
+        :raises ValueError: If the deck is already in the pool.
+        """
+
+        if id(deck) in self._free_ids:
+            raise ValueError("Deck already released to the pool")
+
+        deck.commit()
+        self._free.append(deck)
+        self._free_ids.add(id(deck))
+
+    @contextmanager
+    def deck(self, shuffle: Optional[bool] = None) -> Iterator[Deck]:
+
+        """
+        Lends a deck from the pool for the duration of a ``with`` block.
+
+        :param shuffle: Whether to shuffle the deck, None for the default of
+                        the pool.
+        :return: A context manager yielding a full deck.
+        """
+
+        deck = self.acquire(shuffle)
+
+        try:
+            yield deck
+        finally:
+            self.release(deck)
+
+    def _create(self) -> Deck:
+
+        """
+        Private method to create a new deck for the pool.
+        """
+
+        return Deck(
+            initialise=False, rng=self._rng, ranking=self._ranking,
+            template=self._template
+        )
+
+    def __len__(self) -> int:
+
+        return len(self._free)
@@ -0,0 +1,173 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import comb
+from typing import Mapping, Optional, Tuple, Union
+
+from src.pydecklib.card import Suit, Value
+from src.pydecklib.deck import Deck
+
+# Maximum number of memoized entries of each table, so that long-running
+# processes keep a bounded memory use
+_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def hypergeometric(
+    population: int, successes: int, draws: int
+) -> Tuple[float, ...]:
+
+    """
+    Computes the hypergeometric distribution: the probabilities of drawing
+    exactly k successes, for every k, when drawing without replacement from
+    a population. The most recently used tables are memoized.
+
+    :param population: Number of cards to draw from.
+    :param successes: Number of these cards counting as a success.
+    :param draws: Number of cards drawn.
+    :return: The probability of each number of successes, from 0 to
+             ``min(successes, draws)``.
+    :rtype: Tuple[float, ...]
+
+    :Example:
+        >>> hypergeometric(52, 4, 2)[2] == 1 / 221
+        True
+    """
+
+    if not 0 <= successes <= population or not 0 <= draws <= population:
+        raise ValueError(
+            f"Cannot draw {draws} cards with {successes} successes from "
+            f"{population} cards"
+        )
+
+    total = comb(population, draws)
+
+    return tuple(
+        comb(successes, k) * comb(population - successes, draws - k) / total
+        for k in range(min(successes, draws) + 1)
+    )
+
+
+def pmf(
+    deck: Deck, draws: int, value: Optional[Value] = None,
+    suit: Optional[Suit] = None
+) -> Tuple[float, ...]:
+
+    """
+    Computes the distribution of the number of cards of a value, of a suit,
+    or of both, among the next cards drawn from a deck, the order of the
+    deck being unknown.
+
+    :param deck: The deck to draw from.
+    :param draws: Number of cards drawn.
+    :param value: The value to count, None for any value.
+    :param suit: The suit to count, None for any suit.
+    :return: The probability of each number of matching cards, from 0.
+    :rtype: Tuple[float, ...]
+    """
+
+    return hypergeometric(
+        deck.cards_count, deck.remaining(value, suit), draws
+    )
+
+
+def probability(
+    deck: Deck, draws: int, value: Optional[Value] = None,
+    suit: Optional[Suit] = None, at_least: int = 1,
+    at_most: Optional[int] = None
+) -> float:
+
+    """
+    Computes the probability that the number of cards of a value, of a
+    suit, or of both, among the next cards drawn from a deck is within
+    bounds, the order of the deck being unknown.
+
+    :param deck: The deck to draw from.
+    :param draws: Number of cards drawn.
+    :param value: The value to count, None for any value.
+    :param suit: The suit to count, None for any suit.
+    :param at_least: Minimum number of matching cards.
+    :param at_most: Maximum number of matching cards, None for no maximum.
+    :return: The probability.
+    :rtype: float
+
+    :Example:
+        >>> round(probability(Deck(), 3, suit=Suit.HEARTS), 4)
+        0.5865
+    """
+
+    distribution = pmf(deck, draws, value, suit)
+    if at_most is None:
+        at_most = len(distribution) - 1
+
+    return sum(distribution[max(at_least, 0):at_most + 1])
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _ways(
+    counts: Tuple[int, ...], minimums: Tuple[int, ...], others: int,
+    draws: int
+) -> int:
+
+    """
+    Private function counting the hands of ``draws`` cards holding at least
+    ``minimums[i]`` of the ``counts[i]`` cards of each category i, the
+    ``others`` cards belonging to no category. Memoized on the remaining
+    categories, so that tables are shared between queries, keeping the most
+    recently used entries.
+    """
+
+    if not counts:
+        return comb(others, draws)
+
+    return sum(
+        comb(counts[0], k) * _ways(counts[1:], minimums[1:], others, draws - k)
+        for k in range(minimums[0], min(counts[0], draws) + 1)
+    )
+
+
+def probability_all(
+    deck: Deck, draws: int, minimums: Mapping[Union[Value, Suit], int]
+) -> float:
+
+    """
+    Computes the probability of drawing at least a number of cards of each
+    of several values, or of each of several suits, among the next cards
+    drawn from a deck, the order of the deck being unknown. This is the
+    multivariate hypergeometric distribution.
+
+    :param deck: The deck to draw from.
+    :param draws: Number of cards drawn.
+    :param minimums: The minimum number of cards of each value, or of each
+                     suit.
+    :return: The probability.
+    :rtype: float
+    :raises ValueError: If values and suits are mixed.
+
+    :Example:
+        >>> round(probability_all(
+        ...     Deck(), 5, {Suit.HEARTS: 2, Suit.SPADES: 2}), 4)
+        0.078
+    """
+
+    if len({type(category) for category in minimums}) > 1:
+        raise ValueError("Cannot mix values and suits")
+
+    if draws > deck.cards_count:
+        raise ValueError(
+            f"Cannot draw {draws} cards from a deck of {deck.cards_count}"
+        )
+
+    counts = tuple(
+        deck.remaining(suit=category) if isinstance(category, Suit)
+        else deck.remaining(value=category)
+        for category in minimums
+    )
+    others = deck.cards_count - sum(counts)
+
+    return _ways(
+        counts, tuple(minimums.values()), others, draws
+    ) / comb(deck.cards_count, draws)
@@ -0,0 +1,334 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+import random
+import struct
+from typing import Any, List, MutableSequence, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Kinds of generator states written by dump_rng
+_NO_RNG, _RANDOM, _PCG64 = range(3)
+
+# Mersenne Twister state of random.Random: 624 words, the position in them,
+# and the pending Gaussian value
+_RANDOM_STATE = struct.Struct('<625I?d')
+_PCG64_STATE = struct.Struct('<16s16s?I')
+
+
+class NumpyRandom:
+
+    """
+    Adapts a NumPy ``Generator`` (PCG64, Philox, ...) to the subset of the
+    ``random.Random`` interface used by decks: ``seed``, ``randint``,
+    ``random``, ``sample``, ``shuffle`` and ``getrandbits``.
+
+    :param generator: The NumPy generator to draw from.
+    :type generator: numpy.random.Generator
+
+    :Example:
+        >>> import numpy as np
+        >>> rng = NumpyRandom(np.random.default_rng(42))
+        >>> rng.randint(1, 6)
+        1
+    """
+
+    def __init__(self, generator: Any):
+
+        self._generator = generator
+
+    @property
+    def generator(self) -> Any:
+
+        """
+        Gets the wrapped NumPy generator.
+
+        :return: The NumPy generator.
+        :rtype: numpy.random.Generator
+        """
+
+        return self._generator
+
+    def seed(self, seed: Optional[int] = None) -> None:
+
+        """
+        Reseeds the generator, keeping the same bit generator type.
+
+        :param seed: The new seed.
+        """
+
+        bit_generator = type(self._generator.bit_generator)
+        self._generator = np.random.Generator(bit_generator(seed))
+
+    def randint(self, a: int, b: int) -> int:
+
+        """
+        Returns a random integer in the range [a, b], both ends included.
+        """
+
+        return int(self._generator.integers(a, b, endpoint=True))
+
+    def random(self) -> float:
+
+        """
+        Returns a random float in the range [0, 1).
+        """
+
+        return float(self._generator.random())
+
+    def getrandbits(self, k: int) -> int:
+
+        """
+        Returns a non-negative integer with k random bits.
+        """
+
+        words = self._generator.integers(
+            0, 1 << 32, size=(k + 31) // 32, dtype=np.uint64
+        )
+        value = 0
+        for word in words:
+            value = (value << 32) | int(word)
+
+        return value >> (-k % 32)
+
+    def sample(self, population: Sequence, k: int) -> list:
+
+        """
+        Returns k distinct elements chosen from the population, in random
+        order.
+        """
+
+        indices = self._generator.choice(len(population), k, replace=False)
+
+        return [population[i] for i in indices]
+
+    def shuffle(self, x: MutableSequence) -> None:
+
+        """
+        Shuffles a mutable sequence in place. Byte buffers are shuffled
+        through a zero-copy NumPy view.
+        """
+
+        if isinstance(x, (bytearray, memoryview)):
+            self._generator.shuffle(np.frombuffer(x, dtype=np.uint8))
+        else:
+            self._generator.shuffle(x)
+
+    def spawn(self, n: int) -> List[NumpyRandom]:
+
+        """
+        Creates n independent child generators.
+
+        :param n: Number of children to create.
+        :return: The child generators.
+        """
+
+        return [NumpyRandom(child) for child in self._generator.spawn(n)]
+
+
+def make_rng(rng: Any = None, seed: Optional[int] = None) -> Any:
+
+    """
+    Turns a user-supplied generator into one usable by a deck. NumPy
+    generators are wrapped in a :class:`NumpyRandom`, any other object is
+    expected to follow the ``random.Random`` interface (``seed``,
+    ``randint``, ``random``, ``sample`` and ``shuffle``).
+
+    :param rng: The generator, None for a new ``random.Random``.
+    :param seed: Seed to apply to the generator.
+    :return: The generator to use.
+
+    :Example:
+        >>> rng = make_rng(seed=42)
+        >>> rng.randint(0, 51)
+        40
+    """
+
+    if rng is None:
+        return random.Random(seed)
+
+    if np is not None and isinstance(rng, np.random.Generator):
+        rng = NumpyRandom(rng)
+
+    if seed is not None:
+        rng.seed(seed)
+
+    return rng
+
+
+def spawn_rng(rng: Any, n: int = 1) -> List[Any]:
+
+    """
+    Derives n child generators from a parent generator. The children are
+    reproducible from the state of the parent and statistically independent
+    from it and from each other. Spawning advances the parent.
+
+    NumPy generators use their seed sequence to spawn children. Other
+    generators seed children of the same type from 128 random bits of the
+    parent.
+
+    :param rng: The parent generator.
+    :param n: Number of children to create.
+    :return: The child generators.
+
+    :Example:
+        >>> children = spawn_rng(random.Random(42), 2)
+        >>> len(children)
+        2
+    """
+
+    if np is not None and isinstance(rng, np.random.Generator):
+        return list(rng.spawn(n))
+
+    if hasattr(rng, 'spawn'):
+        return rng.spawn(n)
+
+    return [type(rng)(rng.getrandbits(128)) for _ in range(n)]
+
+
+def derive_rng(rng: Any, key: int) -> Any:
+
+    """
+    Derives a child generator from the current state of a parent generator
+    and a key, without advancing the parent, so that the stream of the
+    parent does not depend on how many children were derived. Children
+    derived with different keys, or from different states, are
+    statistically independent.
+
+    The child is seeded from a hash of the state of the parent and of the
+    key, with a generator of the same type, or a bit generator of the same
+    type for NumPy generators. A parent restored by :func:`load_rng` thus
+    derives the same children. Generators not exposing their state fall
+    back to :func:`spawn_rng`, which advances them.
+
+    :param rng: The parent generator.
+    :param key: Key of the child, such as its index among the children.
+    :return: The child generator.
+
+    :Example:
+        >>> rng = random.Random(42)
+        >>> child = derive_rng(rng, 0)
+        >>> rng.random() == random.Random(42).random()
+        True
+    """
+
+    generator = None
+    if isinstance(rng, NumpyRandom):
+        generator = rng.generator
+    elif np is not None and isinstance(rng, np.random.Generator):
+        generator = rng
+
+    try:
+        state = dump_rng(rng)
+    except ValueError:
+        if generator is None:
+            return spawn_rng(rng)[0]
+        # Bit generators other than PCG64 have no compact form
+        state = pickle.dumps(generator.bit_generator.state)
+
+    digest = hashlib.blake2b(
+        state + key.to_bytes(8, 'little'), digest_size=16
+    ).digest()
+    seed = int.from_bytes(digest, 'little')
+
+    if generator is None:
+        return type(rng)(seed)
+
+    child = np.random.Generator(type(generator.bit_generator)(seed))
+
+    return child if rng is generator else NumpyRandom(child)
+
+
+def dump_rng(rng: Any) -> bytes:
+
+    """
+    Serializes the state of a generator, so that :func:`load_rng` can
+    rebuild a generator continuing the same stream. Supports None,
+    ``random.Random`` (2509 bytes) and NumPy PCG64 generators (38 bytes),
+    the default bit generator of NumPy.
+
+    :param rng: The generator, or None.
+    :return: The serialized state.
+    :raises ValueError: If the generator does not expose its state.
+
+    :Example:
+        >>> rng = make_rng(seed=42)
+        >>> copy = load_rng(dump_rng(rng))
+        >>> copy.random() == rng.random()
+        True
+    """
+
+    if rng is None:
+        return bytes([_NO_RNG])
+
+    rng = make_rng(rng)
+
+    if isinstance(rng, NumpyRandom):
+        state = rng.generator.bit_generator.state
+
+        if state['bit_generator'] == 'PCG64':
+            return bytes([_PCG64]) + _PCG64_STATE.pack(
+                state['state']['state'].to_bytes(16, 'little'),
+                state['state']['inc'].to_bytes(16, 'little'),
+                bool(state['has_uint32']), state['uinteger']
+            )
+
+    if isinstance(rng, random.Random):
+        try:
+            version, words, gauss = rng.getstate()
+        except NotImplementedError:
+            raise ValueError(f"{type(rng).__name__} has no state") from None
+
+        return bytes([_RANDOM]) + _RANDOM_STATE.pack(
+            *words, gauss is not None, gauss or 0.0
+        )
+
+    raise ValueError(f"Cannot serialize a {type(rng).__name__} generator")
+
+
+def load_rng(data: bytes) -> Any:
+
+    """
+    Rebuilds a generator from a state written by :func:`dump_rng`.
+
+    :param data: The serialized state.
+    :return: The generator, or None.
+    """
+
+    kind = data[0]
+
+    if kind == _NO_RNG:
+        return None
+
+    if kind == _RANDOM:
+        *words, has_gauss, gauss = _RANDOM_STATE.unpack_from(data, 1)
+        rng = random.Random()
+        rng.setstate((3, tuple(words), gauss if has_gauss else None))
+
+        return rng
+
+    if np is None:
+        raise ImportError("Loading a NumPy generator requires numpy")
+
+    if kind == _PCG64:
+        state, inc, has_uint32, uinteger = _PCG64_STATE.unpack_from(data, 1)
+        bit_generator = np.random.PCG64()
+        bit_generator.state = {
+            'bit_generator': 'PCG64',
+            'state': {
+                'state': int.from_bytes(state, 'little'),
+                'inc': int.from_bytes(inc, 'little')
+            },
+            'has_uint32': int(has_uint32), 'uinteger': uinteger
+        }
+
+        return NumpyRandom(np.random.Generator(bit_generator))
+
+    raise ValueError(f"Unknown generator state kind: {kind}")
@@ -0,0 +1,312 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+from src.pydecklib.deck import Deck, DeckBatch
+from src.pydecklib.rng import NumpyRandom, make_rng
+from src.pydecklib.template import STANDARD, DeckTemplate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Size in bytes of one result, a float64
+_RESULT_SIZE = 8
+
+
+def _make_rng(rng: Any = None, seed: Optional[int] = None) -> Any:
+
+    """
+    Private function turning a user-supplied generator into the generator of
+    a batch, preferring a NumPy generator when none is given.
+    """
+
+    if rng is None and np is not None:
+        return make_rng(np.random.default_rng(seed))
+
+    return make_rng(rng, seed)
+
+
+class SharedDeckBatch:
+
+    """
+    Represents N decks held in a block of shared memory, one row of card
+    codes per deck, followed by an output buffer of float64 results, a fixed
+    number per deck. Worker processes attach to the block by name and read
+    their decks and write their results through views over subranges of
+    rows, so no deck and no result is ever pickled.
+
+    Pickling a shared batch only sends its name and shape: passing one to a
+    process pool attaches the worker to the same memory. The creating batch
+    owns the block and frees it when closed; batches attached to it only
+    close their own mapping. Views handed out must be dropped before the
+    batch is closed.
+
+    The codes are the integer card codes of :attr:`Card.code`. Decks and
+    results can be viewed as NumPy arrays or, without NumPy, as flat
+    ``memoryview`` objects, row after row.
+
+    :param n: Number of decks in the batch.
+    :type n: int
+    :param shuffle: Flag to shuffle the decks upon initialisation.
+    :type shuffle: bool
+    :param seed: Seed for shuffling operations.
+    :type seed: Optional[int]
+    :param rng: Random number generator owned by the batch, None for a NumPy
+                generator if NumPy is installed, so that all the decks are
+                shuffled in one vectorized call.
+    :type rng: Optional[Any]
+    :param template: Variant of the decks, None for the standard 52 cards.
+    :type template: Optional[DeckTemplate]
+    :param results: Number of results per deck.
+    :type results: int
+
+    :Example:
+        >>> with SharedDeckBatch(1000, shuffle=True, seed=42) as shared:
+        ...     shared.results()[:, 0] = shared.codes()[:, 0] % 13 == 0
+        ...     aces = int(shared.results().sum())
+    """
+
+    def __init__(
+        self, n: int, shuffle: bool = False, seed: Optional[int] = None,
+        rng: Any = None, template: Optional[DeckTemplate] = None,
+        results: int = 1
+    ):
+
+        if template is None:
+            template = STANDARD
+
+        self._n = n
+        self._cards = template.cards_count
+        self._results = results
+        self._rng = _make_rng(rng, seed)
+        self._memory = SharedMemory(create=True, size=max(self._size(), 1))
+        self._owner = True
+
+        self._memory.buf[:n * self._cards] = template.codes * n
+
+        if shuffle:
+            self.shuffle()
+
+    @classmethod
+    def attach(
+        cls, name: str, n: int, cards_count: int, results: int = 1
+    ) -> SharedDeckBatch:
+
+        """
+        Attaches to the shared memory of a batch created by another process.
+        The attached batch can be read from and written to, but not freed.
+
+        :param name: Name of the shared memory block.
+        :param n: Number of decks in the batch.
+        :param cards_count: Number of cards per deck.
+        :param results: Number of results per deck.
+        :return: A batch viewing the same memory.
+        """
+
+        batch = object.__new__(cls)
+        batch._n = n
+        batch._cards = cards_count
+        batch._results = results
+        batch._rng = None
+        batch._owner = False
+
+        try:
+            batch._memory = SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13 has no track parameter
+            batch._memory = SharedMemory(name=name)
+
+        return batch
+
+    @property
+    def name(self) -> str:
+
+        """
+        Gets the name of the shared memory block, to attach to it.
+
+        :return: The name of the block.
+        :rtype: str
+        """
+
+        return self._memory.name
+
+    @property
+    def cards_count(self) -> int:
+
+        """
+        Counts the number of cards in each deck.
+
+        :return: The number of cards per deck.
+        :rtype: int
+        """
+
+        return self._cards
+
+    def shuffle(self, seed: Optional[int] = None) -> None:
+
+        """
+        Shuffles every deck of the batch independently, in place in the
+        shared memory.
+
+        :param seed: Seed for the random shuffle.
+        """
+
+        rng = self._rng if self._rng is not None else _make_rng()
+        if seed:
+            rng.seed(seed)
+        self._rng = rng
+
+        if isinstance(rng, NumpyRandom):
+            codes = self.codes()
+            rng.generator.permuted(codes, axis=1, out=codes)
+            return
+
+        for start in range(0, self._n * self._cards, self._cards):
+            with self._memory.buf[start:start + self._cards] as row:
+                rng.shuffle(row)
+
+    def codes(
+        self, start: int = 0, stop: Optional[int] = None,
+        as_array: bool = True
+    ) -> Any:
+
+        """
+        Gets a writable view of the card codes of a range of decks, top card
+        first.
+
+        :param start: Index of the first deck.
+        :param stop: Index after the last deck, None for the last deck.
+        :param as_array: Whether to return a NumPy array instead of a flat
+                         memoryview.
+        :return: A ``(stop - start, cards_count)`` uint8 array, or a
+                 memoryview of the rows one after the other.
+        """
+
+        start, stop, _ = slice(start, stop).indices(self._n)
+        view = self._memory.buf[start * self._cards:stop * self._cards]
+
+        if not as_array:
+            return view
+
+        if np is None:
+            raise ImportError("Array views require numpy")
+
+        return np.frombuffer(view, dtype=np.uint8).reshape(-1, self._cards)
+
+    def results(
+        self, start: int = 0, stop: Optional[int] = None,
+        as_array: bool = True
+    ) -> Any:
+
+        """
+        Gets a writable view of the results of a range of decks.
+
+        :param start: Index of the first deck.
+        :param stop: Index after the last deck, None for the last deck.
+        :param as_array: Whether to return a NumPy array instead of a flat
+                         memoryview.
+        :return: A ``(stop - start, results)`` float64 array, or a
+                 memoryview of the rows one after the other.
+        """
+
+        start, stop, _ = slice(start, stop).indices(self._n)
+        offset = self._offset()
+        row = self._results * _RESULT_SIZE
+        view = self._memory.buf[offset + start * row:offset + stop * row]
+
+        if not as_array:
+            return view.cast('d')
+
+        if np is None:
+            raise ImportError("Array views require numpy")
+
+        return np.frombuffer(view, dtype=np.float64).reshape(
+            -1, self._results
+        )
+
+    def batch(self, start: int = 0, stop: Optional[int] = None) -> DeckBatch:
+
+        """
+        Gets a range of decks as a :class:`DeckBatch` dealing straight from
+        the shared memory. Shuffling the returned batch copies its decks.
+
+        :param start: Index of the first deck.
+        :param stop: Index after the last deck, None for the last deck.
+        :return: A batch over the decks of the range.
+        """
+
+        return DeckBatch.from_codes(self.codes(start, stop))
+
+    def deck(self, index: int) -> Deck:
+
+        """
+        Converts one deck of the batch to a regular :class:`Deck`.
+
+        :param index: Index of the deck in the batch.
+        :return: A new deck holding the cards of that row.
+        """
+
+        if not 0 <= index < self._n:
+            raise IndexError("Batch index out of range")
+
+        start = index * self._cards
+
+        return Deck.from_codes(self._memory.buf[start:start + self._cards])
+
+    def close(self) -> None:
+
+        """
+        Frees the shared memory block if this batch created it, and closes
+        the mapping of the block.
+
+        :raises BufferError: If views of the batch are still alive.
+        """
+
+        if self._owner:
+            self._owner = False
+            self._memory.unlink()
+        self._memory.close()
+
+    def _size(self) -> int:
+
+        """
+        Private method to compute the size in bytes of the shared memory.
+        """
+
+        return self._offset() + self._n * self._results * _RESULT_SIZE
+
+    def _offset(self) -> int:
+
+        """
+        Private method to compute the offset of the results, after the codes
+        and aligned for float64.
+        """
+
+        return -(-self._n * self._cards // _RESULT_SIZE) * _RESULT_SIZE
+
+    def __getitem__(self, index: int) -> Deck:
+
+        return self.deck(index)
+
+    def __len__(self) -> int:
+
+        return self._n
+
+    def __enter__(self) -> SharedDeckBatch:
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.close()
+
+    def __reduce__(self):
+
+        return SharedDeckBatch.attach, (
+            self.name, self._n, self._cards, self._results
+        )
@@ -0,0 +1,358 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import Any, Generator, Iterable, Iterator, Optional, Union
+
+from src.pydecklib.card import Card, RankingPolicy
+from src.pydecklib.template import DeckTemplate
+from src.pydecklib.deck import (
+    Deck, _BUFFER, _CARDS, _DRAW_ENTRY, _LAZY, _SWAP, _TOP
+)
+
+
+class Shoe(Deck):
+
+    """
+    Represents a dealing shoe: several decks combined, dealt from the
+    top until a cut card is reached, then reshuffled. Like :class:`Deck`, the
+    shoe stores one byte per card.
+
+    Reshuffling is O(1) and allocates nothing: the dealt cards are still in
+    the buffer behind the head cursor, so the cursor is simply rewound. The
+    shuffle itself is done lazily, one Fisher-Yates step per card dealt from
+    the top, which gives the same distribution as shuffling the whole shoe
+    up front. Any other operation on the shoe first completes the shuffle.
+
+    The counters behind :meth:`Deck.remaining` are always kept, and refilled
+    from the known composition of a full shoe on reshuffles, so counting the
+    cards left of a value is O(1).
+
+    :param decks: Number of standard decks in the shoe.
+    :type decks: int
+    :param penetration: Fraction of the shoe dealt before the cut card.
+    :type penetration: float
+    :param shuffle: Flag to shuffle the shoe upon initialisation.
+    :type shuffle: bool
+    :param seed: Seed for shuffling operations.
+    :type seed: Optional[int]
+    :param rng: Random number generator owned by the shoe.
+    :type rng: Optional[Any]
+    :param ranking: Ranking policy of the shoe.
+    :type ranking: Optional[RankingPolicy]
+    :param storage: Storage mode of the shoe, ``"array"`` or ``"blocked"``.
+    :type storage: str
+    :param hash_mode: Hash mode of the shoe, ``"ordered"`` or
+                      ``"composition"``.
+    :type hash_mode: str
+    :param template: Variant of the decks of the shoe, None for standard
+                     52-card decks.
+    :type template: Optional[DeckTemplate]
+
+    :Example:
+        >>> shoe = Shoe(decks=6, penetration=0.75, seed=42)
+        >>> hand = list(shoe.draw(2))
+        >>> shoe.remaining(Value.ACE) + sum(
+        ...     card.value == Value.ACE for card in hand)
+        24
+        >>> while not shoe.needs_reshuffle:
+        ...     _ = next(shoe.draw())
+        >>> shoe.reshuffle()
+        >>> shoe.cards_count
+        312
+    """
+
+    def __init__(
+        self, decks: int = 6, penetration: float = 0.75,
+        shuffle: bool = True, seed: Optional[int] = None, rng: Any = None,
+        ranking: Optional[RankingPolicy] = None, storage: str = 'array',
+        hash_mode: str = 'ordered', template: Optional[DeckTemplate] = None
+    ):
+
+        if not 0 < penetration <= 1:
+            raise ValueError(
+                f"Penetration must be in (0, 1], got {penetration}"
+            )
+
+        super().__init__(
+            initialise=False, seed=seed, rng=rng, ranking=ranking,
+            storage=storage, hash_mode=hash_mode, template=template
+        )
+
+        self._full = self._template.codes * decks
+        self._cut = int(len(self._full) * penetration)
+        self._lazy = False
+        self._deck = self._buffer(self._full)
+        # Whether the buffer still holds a full shoe, only dealt from the top
+        self._intact = True
+
+        # Counters of a full shoe, copied on reshuffles
+        self._compute_counts()
+        self._full_counts = tuple(list(counts) for counts in self._counts)
+        self._full_mask = self._mask
+
+        if shuffle:
+            self.reshuffle()
+
+    @property
+    def cut_card(self) -> int:
+
+        """
+        Gets the position of the cut card, as a number of cards dealt.
+
+        :return: The number of cards dealt before a reshuffle is needed.
+        :rtype: int
+        """
+
+        return self._cut
+
+    @property
+    def needs_reshuffle(self) -> bool:
+
+        """
+        Checks if the cut card has been reached.
+
+        :return: True if the shoe should be reshuffled, False otherwise.
+        :rtype: bool
+        """
+
+        return len(self._full) - self.cards_count >= self._cut
+
+    def reshuffle(self, seed: Optional[int] = None) -> None:
+
+        """
+        Puts all the cards back in the shoe and shuffles it. If no card was
+        removed other than by dealing from the top, this only rewinds the
+        head cursor and defers the shuffle to the next draws.
+
+        :param seed: Seed for the random shuffle.
+        """
+
+        if not self._intact or len(self._deck) != len(self._full) \
+                or self._deck is self._shared:
+            self._set_buffer(self._buffer(self._full))
+        else:
+            self._record(_BUFFER, self._deck, self._head)
+            self._head = 0
+
+        self._intact = True
+        self._hash = None
+        self._refill_counts()
+        self._get_rng(seed)
+        self._set_lazy(True)
+
+    def initialise(
+        self, shuffle: bool = False, n: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> None:
+
+        """
+        Reloads the shoe with all its cards, in order unless shuffled.
+
+        :param shuffle: Whether to shuffle the shoe.
+        :param n: Number of cards to keep in the shoe.
+        :param seed: Seed for the shuffling operation.
+        """
+
+        self._set_buffer(self._buffer(self._full))
+        self._set_lazy(False)
+        self._intact = not n
+
+        if shuffle:
+            self.shuffle(seed)
+
+        if n:
+            self._settle()
+            del self._deck[n:]
+
+        self._invalidate()
+
+    def reset(self, shuffle: bool = False, seed: Optional[int] = None) -> None:
+
+        self._set_lazy(False)
+        super().reset(shuffle, seed)
+        self._intact = True
+
+    def clear(self) -> None:
+
+        self._set_lazy(False)
+        super().clear()
+
+    def shuffle(self, seed: Optional[int] = None) -> None:
+
+        self._compact()
+        self._get_rng(seed)
+        self._set_lazy(True)
+
+    def sort(self, reverse: bool = False) -> None:
+
+        self._settle()
+        super().sort(reverse)
+
+    def draw(self, n: int = 1) -> Generator[Card, None, None]:
+
+        for i in range(n):
+
+            if self._lazy:
+                self._own()
+
+            deck = self._deck
+            head = self._head
+            if head == len(deck):
+                break
+
+            if self._lazy:
+                # One step of Fisher-Yates: bring a random remaining card to
+                # the head
+                swap = self.rng.randint(head, len(deck) - 1)
+                deck[head], deck[swap] = deck[swap], deck[head]
+                self._record(_SWAP, head, swap)
+                self._reorder()
+
+            code = deck[head]
+            self._head = head + 1
+            self._removed(code, _TOP)
+            if self._journal is not None:
+                self._journal.append(_DRAW_ENTRY)
+
+            yield _CARDS[code]
+
+    def draw_bottom(self, n: int = 1) -> Generator[Card, None, None]:
+
+        self._settle()
+        self._intact = False
+
+        return super().draw_bottom(n)
+
+    def draw_random(
+        self, n: int = 1, seed: Optional[int] = None,
+        preserve_order: bool = True
+    ) -> Generator[Card, None, None]:
+
+        self._settle()
+        self._intact = False
+
+        return super().draw_random(n, seed, preserve_order)
+
+    def add_card(
+        self, card: Card, position: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> None:
+
+        self._settle()
+        self._intact = False
+        super().add_card(card, position, seed)
+
+    def add_cards(
+        self, cards: Iterable[Card], seed: Optional[int] = None
+    ) -> None:
+
+        self._settle()
+        self._intact = False
+        super().add_cards(cards, seed)
+
+    @property
+    def codes(self) -> bytes:
+
+        self._settle()
+
+        return super().codes
+
+    def copy(self) -> Deck:
+
+        self._settle()
+
+        return super().copy()
+
+    def fork(self) -> Shoe:
+
+        """
+        Creates a copy-on-write copy of the shoe, see :meth:`Deck.fork`. A
+        pending lazy shuffle stays pending in both shoes, and each completes
+        it on its own, with its own generator.
+
+        :return: A new shoe holding the same cards.
+        """
+
+        return super().fork()
+
+    def _initial_codes(self) -> bytes:
+
+        return self._full
+
+    def _take(self, n: int) -> bytes:
+
+        return bytes(card.code for card in self.draw(n))
+
+    def _settle(self) -> None:
+
+        """
+        Private method to complete a pending lazy shuffle, so that the buffer
+        holds the actual order of the shoe.
+        """
+
+        if self._lazy:
+            self._set_lazy(False)
+            super().shuffle()
+
+    def _refill_counts(self) -> None:
+
+        """
+        Private method to set the counters to those of a full shoe, in place
+        and without scanning the cards.
+        """
+
+        if self._counts is None:
+            self._counts = ([0] * len(_CARDS), [0] * 13, [0] * 4)
+
+        for counts, full in zip(self._counts, self._full_counts):
+            counts[:] = full
+
+        self._mask = self._full_mask
+
+    def _set_lazy(self, lazy: bool) -> None:
+
+        """
+        Private method to set whether a shuffle is pending, keeping the
+        previous state in the journal.
+        """
+
+        self._record(_LAZY, self._lazy)
+        self._lazy = lazy
+
+    def _undo(self, entry: tuple) -> None:
+
+        if entry[0] == _LAZY:
+            self._lazy = entry[1]
+        else:
+            if entry[0] == _BUFFER:
+                # The restored buffer may not hold a full shoe
+                self._intact = False
+            super()._undo(entry)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Card, Deck]:
+
+        self._settle()
+
+        return super().__getitem__(index)
+
+    def __iter__(self) -> Iterator[Card]:
+
+        self._settle()
+
+        return super().__iter__()
+
+    def __eq__(self, other: object) -> bool:
+
+        self._settle()
+        if isinstance(other, Shoe):
+            other._settle()
+
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+
+        self._settle()
+
+        return super().__hash__()
@@ -0,0 +1,242 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import hashlib
+import random
+import secrets
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.pydecklib.deck import Deck, DeckBatch
+from src.pydecklib.shared import SharedDeckBatch
+from src.pydecklib.template import DeckTemplate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def seed_stream(seed: Optional[int] = None) -> Iterator[int]:
+
+    """
+    Derives an endless stream of 128-bit seeds from a master seed. The i-th
+    seed only depends on the master seed and on i, so the stream is
+    reproducible and each seed can be handed to a different worker.
+
+    :param seed: The master seed, None for a random one.
+    :return: A generator yielding the derived seeds.
+
+    :Example:
+        >>> seeds = seed_stream(42)
+        >>> next(seeds) == next(seed_stream(42))
+        True
+    """
+
+    if seed is None:
+        seed = secrets.randbits(128)
+
+    index = 0
+    while True:
+        digest = hashlib.blake2b(
+            f"{seed}/{index}".encode(), digest_size=16
+        ).digest()
+        yield int.from_bytes(digest, 'big')
+        index += 1
+
+
+def _run_chunk(
+    trial: Callable, trials: int, seed: int,
+    reduce: Optional[Callable], batch: bool
+) -> Any:
+
+    """
+    Private function running one chunk of trials with its own seed. In batch
+    mode the chunk is a single call over a shuffled DeckBatch, otherwise one
+    deck is reshuffled before each trial and the results are reduced in
+    trial order.
+    """
+
+    if batch:
+        return trial(DeckBatch(trials, shuffle=True, seed=seed))
+
+    deck = Deck(initialise=False, rng=random.Random(seed))
+    results = []
+
+    for i in range(trials):
+        deck.initialise(shuffle=True)
+        result = trial(deck)
+
+        if reduce is None:
+            results.append(result)
+        elif i == 0:
+            results = result
+        else:
+            results = reduce(results, result)
+
+    return results
+
+
+def simulate(
+    trial: Callable, trials: int, reduce: Optional[Callable] = None,
+    seed: Optional[int] = None, workers: Optional[int] = None,
+    chunk_size: int = 1000, batch: bool = False
+) -> Any:
+
+    """
+    Runs a Monte Carlo experiment over shuffled decks across a process pool.
+
+    The trials are split into chunks of ``chunk_size``. Each chunk gets its
+    own seed from :func:`seed_stream`, so the result only depends on the
+    master seed and the chunk size, never on the number of workers or on the
+    order in which chunks finish. Chunk results are reduced as soon as all
+    the chunks before them are done.
+
+    :param trial: A picklable function called with a freshly shuffled
+                  :class:`Deck` for each trial, or with a shuffled
+                  :class:`DeckBatch` of one chunk in batch mode.
+    :param trials: Number of trials to run.
+    :param reduce: An associative function combining two results, None to
+                   return the list of all results.
+    :param seed: The master seed, None for a random one.
+    :param workers: Number of worker processes, None for one per core and 1
+                    to run in the current process.
+    :param chunk_size: Number of trials per chunk.
+    :param batch: Whether ``trial`` takes a whole chunk as a DeckBatch.
+    :return: The reduced result, or the list of results.
+
+    :Example:
+        >>> def top_is_ace(deck):
+        ...     return int(next(deck.draw()).value == Value.ACE)
+        >>> simulate(top_is_ace, 10000, reduce=operator.add, seed=42)
+        752
+    """
+
+    chunks = [
+        (index, min(chunk_size, trials - start))
+        for index, start in enumerate(range(0, trials, chunk_size))
+    ]
+    seeds = seed_stream(seed)
+    pending: Dict[int, Any] = {}
+    result = None if reduce is not None else []
+    done = 0
+
+    def collect(index: int, chunk_result: Any) -> None:
+
+        nonlocal result, done
+
+        pending[index] = chunk_result
+
+        while done in pending:
+            chunk_result = pending.pop(done)
+
+            if reduce is None:
+                if batch:
+                    result.append(chunk_result)
+                else:
+                    result.extend(chunk_result)
+            elif done == 0:
+                result = chunk_result
+            else:
+                result = reduce(result, chunk_result)
+
+            done += 1
+
+    if workers == 1:
+        for index, size in chunks:
+            collect(
+                index, _run_chunk(trial, size, next(seeds), reduce, batch)
+            )
+
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _run_chunk, trial, size, next(seeds), reduce, batch
+            ): index
+            for index, size in chunks
+        }
+
+        for future in as_completed(futures):
+            collect(futures[future], future.result())
+
+    return result
+
+
+def _run_shared_chunk(
+    trial: Callable, shared: SharedDeckBatch, start: int, stop: int
+) -> None:
+
+    """
+    Private function running one chunk of trials in a worker, over a range
+    of the decks of a shared batch the worker attached to.
+    """
+
+    with shared:
+        trial(shared.batch(start, stop), shared.results(start, stop))
+
+
+def simulate_shared(
+    trial: Callable, trials: int, seed: Optional[int] = None,
+    workers: Optional[int] = None, chunk_size: int = 1000,
+    results: int = 1, template: Optional[DeckTemplate] = None
+) -> Any:
+
+    """
+    Runs a Monte Carlo experiment over shuffled decks across a process pool,
+    through shared memory. All the decks are shuffled up front into a
+    :class:`SharedDeckBatch`; each worker reads a range of them and writes
+    its results straight into the shared output buffer, so only the name of
+    the block and the bounds of the range cross process boundaries. The
+    result only depends on the master seed. Requires NumPy.
+
+    :param trial: A picklable function called with a :class:`DeckBatch` over
+                  the decks of one chunk and the ``(chunk, results)`` float64
+                  array to write the results of these decks in.
+    :param trials: Number of trials to run.
+    :param seed: Seed of the shuffle of the decks.
+    :param workers: Number of worker processes, None for one per core and 1
+                    to run in the current process.
+    :param chunk_size: Number of trials per chunk.
+    :param results: Number of results per trial.
+    :param template: Variant of the decks, None for the standard 52 cards.
+    :return: A ``(trials, results)`` float64 array of the results.
+    :rtype: numpy.ndarray
+
+    :Example:
+        >>> def top_is_ace(batch, out):
+        ...     out[:, 0] = batch.deal(1, 1)[:, 0, 0] % 13 == 0
+        >>> simulate_shared(top_is_ace, 10000, seed=42).sum() > 0
+        True
+    """
+
+    if np is None:
+        raise ImportError("simulate_shared requires numpy")
+
+    with SharedDeckBatch(
+        trials, shuffle=True, rng=np.random.default_rng(seed),
+        template=template, results=results
+    ) as shared:
+        ranges = [
+            (start, min(start + chunk_size, trials))
+            for start in range(0, trials, chunk_size)
+        ]
+
+        if workers == 1:
+            for start, stop in ranges:
+                trial(shared.batch(start, stop), shared.results(start, stop))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _run_shared_chunk, trial, shared, start, stop
+                    )
+                    for start, stop in ranges
+                ]
+                for future in futures:
+                    future.result()
+
+        return shared.results().copy()
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple
+
+from src.pydecklib.card import Card, Suit, Value
+
+
+class DeckTemplate:
+
+    """
+    Describes the cards of a deck variant: which values and suits it uses,
+    and how many copies of each card it holds. The spec is compiled once into
+    a buffer of card codes, in standard order (suit by suit, ace to king,
+    copy after copy), so that decks built from the template are reset with a
+    single buffer copy.
+
+    :param values: Values of the deck, None for all thirteen.
+    :type values: Optional[Iterable[Value]]
+    :param suits: Suits of the deck, None for all four.
+    :type suits: Optional[Iterable[Suit]]
+    :param copies: Number of copies of each card.
+    :type copies: int
+
+    :Example:
+        >>> piquet = DeckTemplate(values=(
+        ...     Value.ACE, Value.SEVEN, Value.EIGHT, Value.NINE, Value.TEN,
+        ...     Value.JACK, Value.QUEEN, Value.KING))
+        >>> piquet.cards_count
+        32
+        >>> Deck(template=piquet).cards_count
+        32
+    """
+
+    __slots__ = ('_values', '_suits', '_copies', '_codes')
+
+    def __init__(
+        self, values: Optional[Iterable[Value]] = None,
+        suits: Optional[Iterable[Suit]] = None, copies: int = 1
+    ):
+
+        values = tuple(Value) if values is None else tuple(values)
+        suits = tuple(Suit) if suits is None else tuple(suits)
+
+        if not values or not suits or copies < 1:
+            raise ValueError("A deck template needs at least one card")
+        if len(set(values)) != len(values) or len(set(suits)) != len(suits):
+            raise ValueError("Values and suits of a template must be unique")
+
+        values = tuple(sorted(values, key=lambda value: value.value))
+        suits = tuple(sorted(suits, key=lambda suit: suit.value))
+
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_suits', suits)
+        object.__setattr__(self, '_copies', copies)
+        object.__setattr__(self, '_codes', bytes(
+            Card(suit, value).code for suit in suits for value in values
+        ) * copies)
+
+    @property
+    def values(self) -> Tuple[Value, ...]:
+
+        """
+        Gets the values of the deck.
+
+        :return: The values, in standard order.
+        :rtype: Tuple[Value, ...]
+        """
+
+        return self._values
+
+    @property
+    def suits(self) -> Tuple[Suit, ...]:
+
+        """
+        Gets the suits of the deck.
+
+        :return: The suits, in standard order.
+        :rtype: Tuple[Suit, ...]
+        """
+
+        return self._suits
+
+    @property
+    def copies(self) -> int:
+
+        """
+        Gets the number of copies of each card.
+
+        :return: The number of copies.
+        :rtype: int
+        """
+
+        return self._copies
+
+    @property
+    def codes(self) -> bytes:
+
+        """
+        Gets the compiled codes of the cards of the deck, top card first.
+
+        :return: The card codes, one byte per card.
+        :rtype: bytes
+        """
+
+        return self._codes
+
+    @property
+    def cards_count(self) -> int:
+
+        """
+        Counts the cards of the deck.
+
+        :return: The number of cards.
+        :rtype: int
+        """
+
+        return len(self._codes)
+
+    @property
+    def cards(self) -> Tuple[Card, ...]:
+
+        """
+        Gets the cards of the deck, top card first.
+
+        :return: The cards.
+        :rtype: Tuple[Card, ...]
+        """
+
+        return tuple(map(Card.from_code, self._codes))
+
+    def __setattr__(self, name, value):
+
+        raise AttributeError("DeckTemplate objects are immutable")
+
+    def __eq__(self, other: object) -> bool:
+
+        if not isinstance(other, DeckTemplate):
+            return NotImplemented
+
+        return self._codes == other._codes
+
+    def __hash__(self) -> int:
+
+        return hash(self._codes)
+
+    def __reduce__(self):
+
+        return DeckTemplate, (self._values, self._suits, self._copies)
+
+    def __repr__(self):
+
+        return (
+            f"DeckTemplate({self.cards_count} cards: {len(self._values)} "
+            f"values, {len(self._suits)} suits, {self._copies} copies)"
+        )
+
+
+_FROM_NINE = (
+    Value.ACE, Value.NINE, Value.TEN, Value.JACK, Value.QUEEN, Value.KING
+)
+
+# The standard 52-card deck
+STANDARD = DeckTemplate()
+
+# The 32-card piquet deck, seven to ace (belote, skat, piquet)
+PIQUET = DeckTemplate(values=(Value.SEVEN, Value.EIGHT) + _FROM_NINE)
+
+# The 48-card pinochle deck, two copies of nine to ace
+PINOCHLE = DeckTemplate(values=_FROM_NINE, copies=2)
+
+# Two standard decks (canasta without jokers, double-deck games)
+DOUBLE = DeckTemplate(copies=2)
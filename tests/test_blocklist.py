@@ -0,0 +1,69 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from src.pydecklib.blocklist import BlockList
+
+# Set the seed
+SEED = 42
+
+
+# test random operations against a bytearray
+@pytest.mark.parametrize('load', [1, 4, 64])
+def test_matches_bytearray(load):
+    rng = random.Random(SEED)
+    expected = bytearray(range(52)) * 4
+    actual = BlockList(expected, load=load)
+
+    for _ in range(2000):
+        operation = rng.randrange(4)
+        if operation == 0 or not expected:
+            index = rng.randint(0, len(expected))
+            value = rng.randrange(52)
+            expected.insert(index, value)
+            actual.insert(index, value)
+        elif operation == 1:
+            index = rng.randrange(len(expected))
+            assert actual.pop(index) == expected.pop(index)
+        elif operation == 2:
+            index = rng.randrange(-len(expected), len(expected))
+            assert actual[index] == expected[index]
+        else:
+            assert actual.pop() == expected.pop()
+
+    assert actual == expected
+    assert len(actual) == len(expected)
+    assert list(actual) == list(expected)
+
+
+# test slices
+test_values = [
+    (slice(None), b'abcdef'),
+    (slice(1, 4), b'bcd'),
+    (slice(None, None, -2), b'fdb')
+]
+
+
+@pytest.mark.parametrize('index, expected', test_values)
+def test_getitem_slice(index, expected):
+    assert BlockList(b'abcdef', load=2)[index] == expected
+
+
+def test_setitem_delitem():
+    codes = BlockList(b'abcdef', load=2)
+    codes[:2] = b'xyz'
+    del codes[-1]
+    codes[0] = ord('w')
+    assert bytes(codes) == b'wyzcde'
+
+
+# test out of range indexes
+@pytest.mark.parametrize('index', [6, -7])
+def test_index_error(index):
+    with pytest.raises(IndexError):
+        BlockList(b'abcdef')[index]
+    with pytest.raises(IndexError):
+        BlockList().pop()
@@ -3,7 +3,9 @@
 
 import pytest
 
-from pydecklib.card import Card, Suit, Value
+from pydecklib.card import (
+    DEFAULT_VALUE_RANKING, Card, RankingPolicy, Suit, Value
+)
 
 # test value
 test_values = [
@@ -174,7 +176,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        True
+        False
     ),
     (
         Card(Suit.DIAMONDS, Value.ACE), Card(Suit.CLUBS, Value.FOUR),
@@ -218,7 +220,7 @@ test_values = [
 @pytest.mark.parametrize(
     'card_a, card_b, suit_ordered, suit_ranking, expected', test_values
 )
-def test_lt(card_a, card_b, suit_ordered, suit_ranking, expected):
+def test_eq(card_a, card_b, suit_ordered, suit_ranking, expected):
     Card.suit_ordered = suit_ordered
     Card.suit_ranking = suit_ranking
     actual = card_a.__eq__(card_b)
@@ -234,7 +236,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        False
+        True
     ),
     (
         Card(Suit.DIAMONDS, Value.TWO), Card(Suit.DIAMONDS, Value.TWO),
@@ -243,7 +245,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        False
+        True
     ),
     (
         Card(Suit.DIAMONDS, Value.ACE), Card(Suit.DIAMONDS, Value.FOUR),
@@ -252,7 +254,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        True
+        False
     ),
     (
         Card(Suit.DIAMONDS, Value.TWO), Card(Suit.CLUBS, Value.FOUR),
@@ -261,7 +263,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        False
+        True
     ),
     (
         Card(Suit.DIAMONDS, Value.TWO), Card(Suit.CLUBS, Value.TWO),
@@ -270,7 +272,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        False
+        True
     ),
     (
         Card(Suit.DIAMONDS, Value.ACE), Card(Suit.CLUBS, Value.FOUR),
@@ -279,7 +281,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        True
+        False
     ),
     (
         Card(Suit.DIAMONDS, Value.TWO), Card(Suit.CLUBS, Value.FOUR),
@@ -288,7 +290,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        True
+        False
     ),
     (
         Card(Suit.DIAMONDS, Value.TWO), Card(Suit.CLUBS, Value.TWO),
@@ -297,7 +299,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        True
+        False
     ),
     (
         Card(Suit.DIAMONDS, Value.ACE), Card(Suit.CLUBS, Value.FOUR),
@@ -306,7 +308,7 @@ test_values = [
             Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2,
             Suit.DIAMONDS: 3
         },
-        True
+        False
     )
 ]
 
@@ -314,9 +316,114 @@ test_values = [
 @pytest.mark.parametrize(
     'card_a, card_b, suit_ordered, suit_ranking, expected', test_values
 )
-def test_lt(card_a, card_b, suit_ordered, suit_ranking, expected):
+def test_le(card_a, card_b, suit_ordered, suit_ranking, expected):
     Card.suit_ordered = suit_ordered
     Card.suit_ranking = suit_ranking
     actual = card_a.__le__(card_b)
     assert actual == expected
 
+
+# test interning
+test_values = [
+    (Suit.DIAMONDS, Value.ACE),
+    (Suit.HEARTS, Value.TWO),
+    (Suit.CLUBS, Value.KING)
+]
+
+
+@pytest.mark.parametrize('suit, value', test_values)
+def test_interned(suit, value):
+    assert Card(suit, value) is Card(suit, value)
+    assert Card.from_code(Card(suit, value).code) is Card(suit, value)
+
+
+# test __hash__
+test_values = [
+    ([Card(Suit.DIAMONDS, Value.TWO), Card(Suit.CLUBS, Value.TWO)], 2),
+    ([Card(Suit.DIAMONDS, Value.TWO), Card(Suit.DIAMONDS, Value.TWO)], 1),
+    ([Card.from_code(code) for code in range(52)], 52)
+]
+
+
+@pytest.mark.parametrize('cards, expected', test_values)
+def test_hash(cards, expected):
+    actual = len(set(cards))
+    assert actual == expected
+
+
+# test immutability
+def test_immutable():
+    card = Card(Suit.SPADES, Value.ACE)
+    with pytest.raises(AttributeError):
+        card._value = Value.KING
+    assert card.value == Value.ACE
+
+
+# test sort_key
+test_values = [
+    (Card(Suit.SPADES, Value.TWO), False, 0),
+    (Card(Suit.SPADES, Value.ACE), False, 12),
+    (Card(Suit.SPADES, Value.TWO), True, 13),
+    (Card(Suit.DIAMONDS, Value.ACE), True, 51)
+]
+
+
+@pytest.mark.parametrize('card, suit_ordered, expected', test_values)
+def test_sort_key(card, suit_ordered, expected):
+    Card.suit_ordered = suit_ordered
+    Card.suit_ranking = {
+        Suit.CLUBS: 0, Suit.SPADES: 1, Suit.HEARTS: 2, Suit.DIAMONDS: 3
+    }
+    actual = card.sort_key
+    assert actual == expected
+
+
+# test class-level rankings cannot be edited in place
+def test_class_ranking_read_only():
+    with pytest.raises(TypeError):
+        Card.value_ranking[Value.ACE] = -1
+    Card.value_ranking = {**Card.value_ranking, Value.ACE: -1}
+    try:
+        assert Card(Suit.SPADES, Value.ACE) < Card(Suit.SPADES, Value.KING)
+        with pytest.raises(TypeError):
+            Card.value_ranking[Value.ACE] = 12
+    finally:
+        Card.value_ranking = DEFAULT_VALUE_RANKING
+
+
+# test RankingPolicy
+ace_low = RankingPolicy(value_ranking={value: value.value for value in Value})
+test_values = [
+    (
+        RankingPolicy(),
+        [Card(Suit.SPADES, Value.ACE), Card(Suit.HEARTS, Value.TWO)],
+        [Card(Suit.HEARTS, Value.TWO), Card(Suit.SPADES, Value.ACE)]
+    ),
+    (
+        ace_low,
+        [Card(Suit.HEARTS, Value.TWO), Card(Suit.SPADES, Value.ACE)],
+        [Card(Suit.SPADES, Value.ACE), Card(Suit.HEARTS, Value.TWO)]
+    ),
+    (
+        RankingPolicy(suit_ordered=True),
+        [Card(Suit.DIAMONDS, Value.TWO), Card(Suit.CLUBS, Value.ACE)],
+        [Card(Suit.CLUBS, Value.ACE), Card(Suit.DIAMONDS, Value.TWO)]
+    )
+]
+
+
+@pytest.mark.parametrize('policy, cards, expected', test_values)
+def test_ranking_policy(policy, cards, expected):
+    actual = policy.sorted(cards)
+    assert actual == expected
+    assert policy.compare(expected[0], expected[1]) < 0
+
+
+def test_ranking_policy_immutable():
+    policy = RankingPolicy()
+    with pytest.raises(AttributeError):
+        policy._suit_ordered = True
+    with pytest.raises(TypeError):
+        policy.value_ranking[Value.ACE] = 0
+    assert policy.replace(suit_ordered=True) != policy
+    assert policy.replace(suit_ordered=False) == policy
@@ -0,0 +1,70 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pydecklib.card import Card, Suit, Value
+from src.pydecklib.cardset import CardSet
+from src.pydecklib.deck import Deck
+
+# Set the seed
+SEED = 42
+
+spades = CardSet.from_codes(range(13))
+aces = CardSet.from_codes([0, 13, 26, 39])
+
+
+# test set algebra
+test_values = [
+    (spades | aces, 16),
+    (spades & aces, 1),
+    (spades - aces, 12),
+    (spades ^ aces, 15),
+    (~spades, 39),
+    (CardSet(), 0),
+    (CardSet.full(), 52)
+]
+
+
+@pytest.mark.parametrize('card_set, expected', test_values)
+def test_len(card_set, expected):
+    actual = len(card_set)
+    assert actual == expected
+    assert len(list(card_set)) == expected
+
+
+# test membership
+test_values = [
+    (spades, Card(Suit.SPADES, Value.KING), True),
+    (spades, Card(Suit.HEARTS, Value.KING), False),
+    (aces, Card(Suit.CLUBS, Value.ACE), True)
+]
+
+
+@pytest.mark.parametrize('card_set, card, expected', test_values)
+def test_contains(card_set, card, expected):
+    actual = card in card_set
+    assert actual == expected
+
+
+# test add, remove and discard
+def test_add_remove():
+    card_set = CardSet()
+    card = Card(Suit.HEARTS, Value.TEN)
+    card_set.add(card)
+    assert card in card_set
+    card_set.remove(card)
+    assert card not in card_set
+    card_set.discard(card)
+    with pytest.raises(KeyError):
+        card_set.remove(card)
+
+
+# test conversions
+def test_deck_round_trip():
+    deck = Deck(shuffle=True, seed=SEED, n=10)
+    card_set = CardSet.from_deck(deck)
+    assert card_set == CardSet(deck)
+    assert list(card_set) == sorted(deck, key=lambda card: card.code)
+    assert card_set.to_deck().codes == card_set.codes
+    assert CardSet.from_mask(card_set.mask) == card_set
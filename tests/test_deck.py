@@ -1,10 +1,17 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import copy
+import pickle
+import random
+from collections import Counter
+
 import pytest
 
-from src.pydecklib.deck import Deck
-from src.pydecklib.card import Card, Suit, Value
+from src.pydecklib import deck as deck_module
+from src.pydecklib.deck import Deck, DeckBatch
+from src.pydecklib.card import Card, RankingPolicy, Suit, Value
+from src.pydecklib.template import PINOCHLE
 
 # Set the seed
 SEED = 42
@@ -213,6 +220,21 @@ def test_add_card(deck, card, position, expected):
     assert deck == expected
 
 
+# test add_card positions count from the top card, even after draws
+test_values = [(1, 1), (100, 47), (-1, 46), (-100, 0)]
+
+
+@pytest.mark.parametrize('position, expected', test_values)
+def test_add_card_position(position, expected):
+    deck = Deck()
+    list(deck.draw(5))
+    codes = list(deck.codes)
+    card = Card(Suit.HEARTS, Value.TEN)
+    deck.add_card(card, position=position)
+    codes.insert(expected, card.code)
+    assert list(deck.codes) == codes
+
+
 # test add_cards
 test_values = [
     (
@@ -234,8 +256,8 @@ test_values = [
         [Card(Suit.SPADES, Value.KING), Card(Suit.DIAMONDS, Value.KING)],
         Deck(
             override=(
-                Card(Suit.SPADES, Value.KING), Card(Suit.SPADES, Value.TWO),
-                Card(Suit.DIAMONDS, Value.KING)
+                Card(Suit.DIAMONDS, Value.KING), Card(Suit.SPADES, Value.TWO),
+                Card(Suit.SPADES, Value.KING)
             )
         )
 
@@ -248,3 +270,571 @@ def test_add_cards(deck, cards, expected):
     deck.add_cards(cards, seed=SEED)
     assert deck == expected
 
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_add_cards_merge(use_numpy, monkeypatch):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(deck_module, 'np', None)
+
+    deck = Deck(shuffle=True, seed=SEED)
+    drawn = list(deck.draw(30))
+    positions = random.Random(SEED).sample(range(52), 30)
+    deck.add_cards(drawn, seed=SEED)
+
+    expected = [None] * 52
+    for position, card in zip(positions, drawn):
+        expected[position] = card
+    remaining = iter(Deck(shuffle=True, seed=SEED)[30:])
+    expected = [card or next(remaining) for card in expected]
+    assert list(deck) == expected
+
+
+def test_add_cards_distribution():
+    # Adding two cards to a deck of two cards has 4! / 2! = 12 equally
+    # likely outcomes, as when adding them one after another
+    rng = random.Random(SEED)
+    counts = Counter()
+    for _ in range(12000):
+        deck = Deck(n=2, rng=rng)
+        deck.add_cards([Card(Suit.CLUBS, Value.TWO),
+                        Card(Suit.CLUBS, Value.THREE)])
+        counts[deck.codes] += 1
+
+    assert len(counts) == 12
+    assert all(850 < count < 1150 for count in counts.values())
+
+
+# test codes
+test_values = [
+    (Deck(n=3), b'\x00\x01\x02'),
+    (Deck(initialise=False), b''),
+    (Deck(override=(Card(Suit.CLUBS, Value.KING),)), bytes([51]))
+]
+
+
+@pytest.mark.parametrize('deck, expected', test_values)
+def test_codes(deck, expected):
+    actual = deck.codes
+    assert actual == expected
+    assert Deck.from_codes(actual) == deck
+
+
+# test copy
+test_values = [
+    Deck(),
+    Deck(shuffle=True, seed=SEED),
+    Deck(initialise=False)
+]
+
+
+@pytest.mark.parametrize('deck', test_values)
+def test_copy(deck):
+    count = deck.cards_count
+    copy = deck.copy()
+    assert copy == deck
+    list(copy.draw())
+    assert deck.cards_count == count
+
+
+# test fork
+test_values = [
+    lambda deck: list(deck.draw(5)),
+    lambda deck: list(deck.draw_bottom(5)),
+    lambda deck: list(deck.draw_random(5)),
+    lambda deck: list(deck.draw_random(5, preserve_order=False)),
+    lambda deck: deck.add_card(Card(Suit.SPADES, Value.ACE)),
+    lambda deck: deck.add_cards(list(deck.draw(5))),
+    lambda deck: deck.shuffle(),
+    lambda deck: deck.sort(),
+    lambda deck: deck.clear()
+]
+
+
+@pytest.mark.parametrize('operation', test_values)
+@pytest.mark.parametrize('storage', ['array', 'blocked'])
+def test_fork(operation, storage):
+    deck = Deck(shuffle=True, seed=SEED, storage=storage)
+    list(deck.draw(3))
+    expected = deck.copy()
+
+    child = deck.fork()
+    assert child == deck
+    operation(child)
+    assert deck == expected
+
+    grandchild = deck.fork()
+    operation(deck)
+    assert grandchild == expected
+
+
+# test forks get their own generators
+@pytest.mark.parametrize('factory', [random.Random, 'numpy'])
+def test_fork_rng(factory):
+    if factory == 'numpy':
+        np = pytest.importorskip('numpy')
+        factory = np.random.default_rng
+
+    def explore(forks):
+        deck = Deck(rng=factory(SEED))
+        children = [deck.fork() for _ in range(forks)]
+        for child in children:
+            child.shuffle()
+        deck.shuffle()
+        return deck.codes, [child.codes for child in children]
+
+    expected, _ = explore(0)
+    actual, children = explore(3)
+    assert actual == expected
+    assert len(set(children + [actual])) == 4
+    assert explore(3) == (actual, children)
+
+    # A restored deck forks the same children
+    deck = Deck(rng=factory(SEED))
+    restored = Deck.from_bytes(deck.to_bytes())
+    child = deck.fork()
+    child.shuffle()
+    replayed = restored.fork()
+    replayed.shuffle()
+    assert replayed == child
+
+
+def test_fork_draw_shares_buffer():
+    deck = Deck()
+    child = deck.fork()
+    assert list(child.draw(2)) == list(deck[:2])
+    assert child._deck is deck._deck
+    child.shuffle()
+    assert child._deck is not deck._deck
+    assert deck == Deck()
+
+
+# test checkpoint and rollback
+operations = [
+    lambda deck: list(deck.draw(3)),
+    lambda deck: list(deck.draw_bottom(2)),
+    lambda deck: list(deck.draw_random(2)),
+    lambda deck: list(deck.draw_random(2, preserve_order=False)),
+    lambda deck: deck.add_card(Card(Suit.SPADES, Value.ACE)),
+    lambda deck: deck.add_card(Card(Suit.HEARTS, Value.TEN), position=3),
+    lambda deck: deck.add_card(Card(Suit.HEARTS, Value.TEN), position=100),
+    lambda deck: deck.add_card(Card(Suit.HEARTS, Value.TEN), position=-1),
+    lambda deck: deck.add_cards(list(deck.draw_bottom(4))),
+    lambda deck: deck.deal(2, 2),
+    lambda deck: deck.shuffle(),
+    lambda deck: deck.sort(),
+    lambda deck: deck.fork().shuffle(),
+    lambda deck: deck[3:],
+    lambda deck: deck.initialise(n=40)
+]
+
+
+@pytest.mark.parametrize('storage', ['array', 'blocked'])
+def test_rollback(storage):
+    rng = random.Random(SEED)
+    deck = Deck(shuffle=True, seed=SEED, storage=storage)
+    history = []
+
+    for _ in range(200):
+        if deck.cards_count < 10:
+            deck.initialise(shuffle=True)
+        history.append((deck.checkpoint(), deck.codes))
+        rng.choice(operations)(deck)
+
+    for checkpoint, codes in reversed(history):
+        deck.rollback(checkpoint)
+        assert deck.codes == codes
+
+
+def test_rollback_fork():
+    deck = Deck()
+    checkpoint = deck.checkpoint()
+    list(deck.draw_bottom(2))
+    deck.add_card(Card(Suit.SPADES, Value.ACE), position=5)
+    child = deck.fork()
+    expected = child.codes
+    deck.rollback(checkpoint)
+    assert deck == Deck()
+    assert child.codes == expected
+
+
+def test_rollback_earlier_fork():
+    deck = Deck()
+    checkpoint = deck.checkpoint()
+    first = deck.fork()
+    list(deck.draw_bottom(1))
+    second = deck.fork()
+    deck.rollback(checkpoint)
+    deck.add_card(Card(Suit.CLUBS, Value.KING), position=1)
+    assert first == Deck()
+    assert second.codes == Deck().codes[:-1]
+    assert deck.cards_count == 53
+
+
+def test_rollback_error():
+    deck = Deck()
+    with pytest.raises(ValueError):
+        deck.rollback(0)
+    checkpoint = deck.checkpoint()
+    deck.commit()
+    with pytest.raises(ValueError):
+        deck.rollback(checkpoint)
+
+
+# test the incremental hash
+@pytest.mark.parametrize('hash_mode', ['ordered', 'composition'])
+@pytest.mark.parametrize('storage', ['array', 'blocked'])
+def test_zobrist(hash_mode, storage):
+    rng = random.Random(SEED)
+    deck = Deck(shuffle=True, seed=SEED, hash_mode=hash_mode, storage=storage)
+    checkpoint = deck.checkpoint()
+    expected = deck.zobrist
+
+    for _ in range(200):
+        if deck.cards_count < 10:
+            deck.initialise(shuffle=True)
+        rng.choice(operations)(deck)
+        actual = deck.zobrist
+        assert actual == Deck(override=list(deck), hash_mode=hash_mode).zobrist
+        assert hash(deck) == hash(deck.copy())
+
+    deck.rollback(checkpoint)
+    assert deck.zobrist == expected
+
+
+def test_hash_modes():
+    ordered = Deck(shuffle=True, seed=SEED)
+    composition = Deck(shuffle=True, seed=SEED, hash_mode='composition')
+    assert ordered.zobrist != Deck().zobrist
+    assert composition.zobrist == Deck(hash_mode='composition').zobrist
+    assert len({Deck(), Deck(), ordered}) == 2
+    assert Deck() != Deck(hash_mode='composition')
+    assert Deck(hash_mode='composition') not in {Deck(): 1}
+    assert Deck(hash_mode='composition') in {
+        Deck(hash_mode='composition'): 1
+    }
+    assert {Deck(hash_mode='composition'): 1}.get(composition) == 1
+    assert composition != ordered
+    with pytest.raises(ValueError):
+        Deck(hash_mode='sorted')
+
+
+# test the composition counters
+@pytest.mark.parametrize('storage', ['array', 'blocked'])
+def test_remaining(storage):
+    rng = random.Random(SEED)
+    deck = Deck(shuffle=True, seed=SEED, storage=storage)
+    deck.remaining()
+    checkpoint = deck.checkpoint()
+
+    for _ in range(200):
+        if deck.cards_count < 10:
+            deck.initialise(shuffle=True)
+        rng.choice(operations)(deck)
+
+        codes = Counter(deck.codes)
+        assert deck.mask == sum(1 << code for code in codes)
+        assert deck.remaining() == deck.cards_count
+        for suit in Suit:
+            assert deck.remaining(suit=suit) == sum(
+                count for code, count in codes.items()
+                if code // 13 == suit.value
+            )
+        for value in Value:
+            assert deck.remaining(value) == sum(
+                count for code, count in codes.items()
+                if code % 13 == value.value - 1
+            )
+            assert deck.remaining(value, Suit.CLUBS) \
+                == codes[Card(Suit.CLUBS, value).code]
+
+    deck.rollback(checkpoint)
+    assert deck.remaining(suit=Suit.HEARTS) == 13
+
+
+# test __getitem__
+test_values = [
+    (Deck(), 0, Card(Suit.SPADES, Value.ACE)),
+    (Deck(), -1, Card(Suit.CLUBS, Value.KING)),
+    (
+        Deck(), slice(1, 3),
+        Deck(
+            override=(
+                Card(Suit.SPADES, Value.TWO), Card(Suit.SPADES, Value.THREE)
+            )
+        )
+    )
+]
+
+
+@pytest.mark.parametrize('deck, index, expected', test_values)
+def test_getitem(deck, index, expected):
+    actual = deck[index]
+    assert actual == expected
+
+
+# test mixed top and bottom operations
+test_values = [
+    (Deck(n=4), 2, 1, Card(Suit.SPADES, Value.KING), [2, 12]),
+    (Deck(n=4), 4, 0, Card(Suit.SPADES, Value.KING), [12]),
+    (Deck(n=2), 3, 3, Card(Suit.HEARTS, Value.TWO), [14])
+]
+
+
+@pytest.mark.parametrize('deck, top, bottom, card, expected', test_values)
+def test_draw_then_add(deck, top, bottom, card, expected):
+    list(deck.draw(top))
+    list(deck.draw_bottom(bottom))
+    deck.add_card(card, position=deck.cards_count or None)
+    assert list(deck.codes) == expected
+    assert deck.cards_count == len(expected)
+
+
+# test DeckBatch.shuffle
+def test_batch_shuffle():
+    pytest.importorskip('numpy')
+    batch = DeckBatch(100, shuffle=True, seed=SEED)
+    rows = {bytes(row) for row in batch.codes}
+    assert len(rows) == 100
+    assert all(sorted(row) == list(range(52)) for row in rows)
+    assert DeckBatch(100, shuffle=True, seed=SEED).codes.tolist() == \
+        batch.codes.tolist()
+
+
+# test DeckBatch.deal
+test_values = [
+    (2, 3, 'round_robin', [[0, 2, 4], [1, 3, 5]]),
+    (2, 3, 'block', [[0, 1, 2], [3, 4, 5]]),
+    (1, 1, 'block', [[0]])
+]
+
+
+@pytest.mark.parametrize('players, cards_each, order, expected', test_values)
+def test_batch_deal(players, cards_each, order, expected):
+    pytest.importorskip('numpy')
+    batch = DeckBatch(3)
+    actual = batch.deal(players, cards_each, order=order)
+    assert actual.tolist() == [expected] * 3
+    assert batch.cards_count == 52 - players * cards_each
+    assert batch[1] == Deck.from_codes(range(players * cards_each, 52))
+
+
+# test deal
+test_values = [
+    (2, 2, 'round_robin', [[0, 2], [1, 3]]),
+    (2, 2, 'block', [[0, 1], [2, 3]]),
+    (3, 1, 'round_robin', [[0], [1], [2]])
+]
+
+
+@pytest.mark.parametrize('players, cards_each, order, expected', test_values)
+def test_deal(players, cards_each, order, expected):
+    deck = Deck()
+    hands = deck.deal(players, cards_each, order=order)
+    assert hands == [tuple(map(Card.from_code, hand)) for hand in expected]
+    assert deck == Deck.from_codes(range(players * cards_each, 52))
+
+
+@pytest.mark.parametrize('order', ['round_robin', 'block'])
+def test_deal_array(order):
+    pytest.importorskip('numpy')
+    expected = Deck(shuffle=True, seed=SEED).deal(4, 5, order=order)
+    actual = Deck(shuffle=True, seed=SEED).deal(4, 5, order, as_array=True)
+    assert actual.tolist() == [
+        [card.code for card in hand] for hand in expected
+    ]
+
+
+deal_errors = [
+    (6, 9, 'round_robin'), (2, 2, 'spiral'), (-1, -2, 'round_robin'),
+    (0, 5, 'block'), (2, 0, 'block')
+]
+
+
+@pytest.mark.parametrize('players, cards_each, order', deal_errors)
+def test_deal_error(players, cards_each, order):
+    deck = Deck()
+    with pytest.raises(ValueError):
+        deck.deal(players, cards_each, order=order)
+    assert deck.cards_count == 52
+
+
+@pytest.mark.parametrize('players, cards_each, order', deal_errors)
+def test_batch_deal_error(players, cards_each, order):
+    pytest.importorskip('numpy')
+    batch = DeckBatch(3)
+    with pytest.raises(ValueError):
+        batch.deal(players, cards_each, order=order)
+    assert batch.cards_count == 52
+
+
+# test sort
+test_values = [
+    (
+        Deck(override=(
+            Card(Suit.HEARTS, Value.ACE), Card(Suit.CLUBS, Value.TWO),
+            Card(Suit.SPADES, Value.TEN), Card(Suit.SPADES, Value.TWO)
+        )),
+        False,
+        [
+            Card(Suit.CLUBS, Value.TWO), Card(Suit.SPADES, Value.TWO),
+            Card(Suit.SPADES, Value.TEN), Card(Suit.HEARTS, Value.ACE)
+        ]
+    ),
+    (
+        Deck(override=(
+            Card(Suit.HEARTS, Value.ACE), Card(Suit.CLUBS, Value.TWO),
+            Card(Suit.SPADES, Value.TEN), Card(Suit.SPADES, Value.TWO)
+        )),
+        True,
+        [
+            Card(Suit.HEARTS, Value.ACE), Card(Suit.SPADES, Value.TEN),
+            Card(Suit.CLUBS, Value.TWO), Card(Suit.SPADES, Value.TWO)
+        ]
+    )
+]
+
+
+@pytest.mark.parametrize('deck, reverse, expected', test_values)
+def test_sort(deck, reverse, expected):
+    deck.sort(reverse=reverse)
+    assert list(deck) == expected
+
+
+def test_sort_matches_sorted():
+    deck = Deck(shuffle=True, seed=SEED)
+    expected = sorted(deck)
+    deck.sort()
+    assert list(deck) == expected
+
+
+# test sort with a ranking policy
+def test_sort_ranking():
+    ace_low = RankingPolicy(
+        value_ranking={value: value.value for value in Value}
+    )
+    deck = Deck(shuffle=True, seed=SEED, ranking=ace_low)
+    deck.sort()
+    assert [card.value for card in deck.draw(4)] == [Value.ACE] * 4
+    assert deck.copy().ranking == ace_low
+
+
+# test blocked storage
+def test_blocked_storage():
+    array = Deck(shuffle=True, seed=SEED)
+    blocked = Deck(shuffle=True, seed=SEED, storage='blocked')
+    assert blocked.storage == 'blocked'
+    assert array == blocked
+
+    assert list(array.draw_random(10, seed=SEED)) \
+        == list(blocked.draw_random(10, seed=SEED))
+    card = Card(Suit.SPADES, Value.ACE)
+    array.add_card(card, seed=SEED)
+    blocked.add_card(card, seed=SEED)
+    assert array == blocked
+    assert blocked.copy().storage == 'blocked'
+    assert blocked[:5].storage == 'blocked'
+
+
+def test_unknown_storage():
+    with pytest.raises(ValueError):
+        Deck(storage='linked')
+
+
+# test draw_random without preserving the order
+def test_draw_random_swap_remove():
+    deck = Deck()
+    drawn = list(deck.draw_random(5, seed=SEED, preserve_order=False))
+    assert drawn == list(Deck().draw_random(1, seed=SEED)) + drawn[1:]
+    assert deck.cards_count == 47
+    assert sorted(deck.codes + bytes(card.code for card in drawn)) \
+        == list(range(52))
+    assert deck != Deck(override=[card for card in Deck()
+                                  if card not in drawn])
+
+
+# test membership
+def test_contains():
+    deck = Deck(shuffle=True, seed=SEED)
+    top = deck[0]
+    assert top in deck
+    list(deck.draw(1))
+    assert top not in deck
+    deck.add_card(top, position=10)
+    assert top in deck
+    assert 'A' not in deck
+    assert top not in Deck(initialise=False)
+
+
+# test to_bytes and from_bytes
+test_values = [
+    dict(),
+    dict(storage='blocked', hash_mode='composition'),
+    dict(template=PINOCHLE),
+    dict(rng='numpy')
+]
+
+
+@pytest.mark.parametrize('kwargs', test_values)
+def test_to_bytes(kwargs):
+    if kwargs.get('rng') == 'numpy':
+        np = pytest.importorskip('numpy')
+        kwargs = dict(rng=np.random.default_rng(SEED))
+    deck = Deck(shuffle=True, seed=SEED, **kwargs)
+    list(deck.draw(5))
+    restored = Deck.from_bytes(deck.to_bytes())
+    assert restored == deck
+    assert restored.storage == deck.storage
+    assert restored.hash_mode == deck.hash_mode
+    assert restored.template == deck.template
+    assert hash(restored) == hash(deck)
+    restored.shuffle()
+    deck.shuffle()
+    assert restored == deck
+
+
+def test_to_bytes_size():
+    deck = Deck(shuffle=True, seed=SEED)
+    assert len(deck.to_bytes(include_rng=False)) == 14 + 52 + 1
+    assert Deck.from_bytes(deck.to_bytes(include_rng=False)) == deck
+
+
+@pytest.mark.parametrize('data', [b'', b'PDK', Deck().to_bytes()[:-1],
+                                  b'XYZ' + Deck().to_bytes()[3:]])
+def test_from_bytes_error(data):
+    with pytest.raises(ValueError):
+        Deck.from_bytes(data)
+
+
+# test pickling
+@pytest.mark.parametrize('protocol', [2, 4, 5])
+@pytest.mark.parametrize('storage', ['array', 'blocked'])
+def test_pickle(protocol, storage):
+    ace_low = RankingPolicy(
+        value_ranking={value: value.value for value in Value}
+    )
+    deck = Deck(shuffle=True, seed=SEED, storage=storage, ranking=ace_low)
+    list(deck.draw(5))
+    restored = pickle.loads(pickle.dumps(deck, protocol))
+    assert restored == deck
+    assert restored.storage == storage
+    assert restored.ranking == ace_low
+    assert restored.rng.random() == deck.rng.random()
+    assert copy.deepcopy(deck) == deck
+
+
+def test_pickle_out_of_band():
+    deck = Deck(shuffle=True, seed=SEED)
+    list(deck.draw(5))
+    expected = deck.codes
+    buffers = []
+    data = pickle.dumps(deck, 5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    assert len(data) < len(pickle.dumps(deck, 4))
+
+    # The exported buffer is left untouched by later changes to the deck
+    for operation in operations:
+        operation(deck)
+    restored = pickle.loads(data, buffers=buffers)
+    assert restored.codes == expected
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from src.pydecklib.card import Card, Suit, Value
+from src.pydecklib.deck import DeckBatch
+from src.pydecklib.eval import (
+    HandCategory, evaluate, evaluate_batch, hand_category
+)
+
+# Set the seed
+SEED = 42
+
+
+def hand(*cards):
+    return [Card(suit, value) for suit, value in cards]
+
+
+# test evaluate
+test_values = [
+    (
+        hand(
+            (Suit.SPADES, Value.TEN), (Suit.SPADES, Value.JACK),
+            (Suit.SPADES, Value.QUEEN), (Suit.SPADES, Value.KING),
+            (Suit.SPADES, Value.ACE)
+        ),
+        1
+    ),
+    (
+        hand(
+            (Suit.HEARTS, Value.ACE), (Suit.HEARTS, Value.TWO),
+            (Suit.HEARTS, Value.THREE), (Suit.HEARTS, Value.FOUR),
+            (Suit.HEARTS, Value.FIVE)
+        ),
+        10
+    ),
+    (
+        hand(
+            (Suit.SPADES, Value.ACE), (Suit.HEARTS, Value.ACE),
+            (Suit.DIAMONDS, Value.ACE), (Suit.CLUBS, Value.ACE),
+            (Suit.CLUBS, Value.KING)
+        ),
+        11
+    ),
+    (
+        hand(
+            (Suit.SPADES, Value.SEVEN), (Suit.HEARTS, Value.FIVE),
+            (Suit.DIAMONDS, Value.FOUR), (Suit.CLUBS, Value.THREE),
+            (Suit.CLUBS, Value.TWO)
+        ),
+        7462
+    ),
+    (
+        hand(
+            (Suit.SPADES, Value.SEVEN), (Suit.HEARTS, Value.FIVE),
+            (Suit.DIAMONDS, Value.FOUR), (Suit.CLUBS, Value.THREE),
+            (Suit.CLUBS, Value.TWO), (Suit.SPADES, Value.TWO),
+            (Suit.HEARTS, Value.TWO)
+        ),
+        2459
+    )
+]
+
+
+@pytest.mark.parametrize('cards, expected', test_values)
+def test_evaluate(cards, expected):
+    actual = evaluate(cards)
+    assert actual == expected
+    assert evaluate([card.code for card in cards]) == expected
+
+
+# test evaluate keeps the best five cards
+def test_evaluate_best_five():
+    pytest.importorskip('numpy')
+    batch = DeckBatch(300, shuffle=True, seed=SEED)
+    for cards in batch.deal(1, 7)[:, 0].tolist():
+        expected = min(evaluate(five) for five in combinations(cards, 5))
+        assert evaluate(cards) == expected
+
+
+# test evaluate accepts NumPy integer codes
+def test_evaluate_numpy_codes():
+    pytest.importorskip('numpy')
+    hand = DeckBatch(1, shuffle=True, seed=SEED).codes[0][:7]
+    assert evaluate(hand) == evaluate(hand.tolist())
+
+
+# test hand categories over all distinct five-card hands
+def test_hand_category():
+    actual = Counter(hand_category(rank) for rank in range(1, 7463))
+    assert actual == {
+        HandCategory.STRAIGHT_FLUSH: 10,
+        HandCategory.FOUR_OF_A_KIND: 156,
+        HandCategory.FULL_HOUSE: 156,
+        HandCategory.FLUSH: 1277,
+        HandCategory.STRAIGHT: 10,
+        HandCategory.THREE_OF_A_KIND: 858,
+        HandCategory.TWO_PAIR: 858,
+        HandCategory.ONE_PAIR: 2860,
+        HandCategory.HIGH_CARD: 1277
+    }
+
+
+# test evaluate_batch
+@pytest.mark.parametrize('k', [5, 6, 7])
+def test_evaluate_batch(k):
+    pytest.importorskip('numpy')
+    hands = DeckBatch(2000, shuffle=True, seed=SEED).deal(1, k)[:, 0]
+    actual = evaluate_batch(hands).tolist()
+    expected = [evaluate(cards) for cards in hands.tolist()]
+    assert actual == expected
+
+
+def test_evaluate_errors():
+    with pytest.raises(ValueError):
+        evaluate(range(4))
+    pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        evaluate_batch([[0, 1, 2, 3]])
@@ -0,0 +1,76 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pydecklib.card import Card, Suit, Value
+from src.pydecklib.deck import Deck
+from src.pydecklib.history import decode_cards, read_cards
+
+np = pytest.importorskip('numpy')
+
+# Set the seed
+SEED = 42
+
+HISTORY = (
+    'Hand #1: Hero [As Kd]\n'
+    'Board: 🂡 🃞 Th\n'
+    'As expected, Ask folds\n'
+    '\n'
+    'Hand #2: Hero [2c 3h] 9s\n'
+)
+
+
+# test decode_cards
+test_values = [
+    (b'[As Td]', [0, 35], [1, 4]),
+    (b'As,Ask Kh2 9c\nQs', [0, 47, 11], [0, 11, 14]),
+    ('🂡 🂮 🃑 🂠'.encode(), [0, 12, 39], [0, 5, 10]),
+    (b'', [], []),
+    (b'A', [], [])
+]
+
+
+@pytest.mark.parametrize('data, codes, offsets', test_values)
+def test_decode_cards(data, codes, offsets):
+    actual_codes, actual_offsets = decode_cards(data)
+    assert actual_codes.dtype == np.uint8
+    assert actual_codes.tolist() == codes
+    assert actual_offsets.tolist() == offsets
+
+
+def test_decode_cards_glyphs():
+    deck = Deck(shuffle=True, seed=SEED)
+    codes, _ = decode_cards(' '.join(map(repr, deck)).encode())
+    assert codes.tobytes() == deck.codes
+
+
+# test read_cards
+@pytest.mark.parametrize('chunk_size', [1, 10, 30, 1 << 20])
+def test_read_cards(tmp_path, chunk_size):
+    path = tmp_path / 'hands.txt'
+    path.write_text(HISTORY * 3, encoding='utf-8')
+    chunks = list(read_cards(str(path), chunk_size=chunk_size))
+    codes = np.concatenate([chunk.cards for chunk in chunks])
+    lines = np.concatenate([chunk.lines for chunk in chunks])
+    assert codes.tolist() == [0, 38, 0, 51, 22, 0, 40, 15, 8] * 3
+    assert lines.tolist() == [
+        line + 5 * i for i in range(3) for line in [0, 0, 1, 1, 1, 2, 4, 4, 4]
+    ]
+
+
+def test_read_cards_as_cards(tmp_path):
+    path = tmp_path / 'hands.txt'
+    path.write_text(HISTORY, encoding='utf-8')
+    cards = [card for chunk in read_cards(str(path), as_cards=True)
+             for card in chunk.cards]
+    assert cards[:2] == [Card(Suit.SPADES, Value.ACE),
+                         Card(Suit.DIAMONDS, Value.KING)]
+
+
+def test_read_cards_empty(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    assert list(read_cards(str(path))) == []
+    with pytest.raises(ValueError):
+        list(read_cards(str(path), chunk_size=0))
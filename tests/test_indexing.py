@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import random
+from itertools import combinations, permutations
+
+import pytest
+
+from src.pydecklib.card import Card, Suit, Value
+from src.pydecklib.indexing import (
+    canonical_rank, canonicalize, canonicalize_hands, hand_count,
+    rank_hand, rank_hands, unrank_hand, unrank_hands
+)
+
+# Set the seed
+SEED = 42
+
+
+# test rank_hand is a bijection onto 0..C(n, k) - 1 in colex order
+@pytest.mark.parametrize('k', [1, 2, 3])
+def test_rank_hand(k):
+    hands = sorted(combinations(range(52), k), key=lambda h: h[::-1])
+    assert [rank_hand(hand) for hand in hands] == list(range(hand_count(k)))
+    assert [unrank_hand(i, k) for i in range(hand_count(k))] == hands
+
+
+test_values = [
+    ([Card(Suit.SPADES, Value.ACE), Card(Suit.SPADES, Value.THREE)], 1),
+    ([51, 50, 49, 48, 47], 2598959),
+    ([4, 3, 2, 1, 0], 0)
+]
+
+
+@pytest.mark.parametrize('cards, expected', test_values)
+def test_rank_hand_values(cards, expected):
+    assert rank_hand(cards) == expected
+
+
+def test_rank_hand_numpy_codes():
+    np = pytest.importorskip('numpy')
+    hand = np.array([51, 50, 49, 48, 47], dtype=np.uint8)
+    assert rank_hand(hand) == 2598959
+    assert canonicalize(hand) == canonicalize(hand.tolist())
+
+
+def test_unrank_hand_error():
+    with pytest.raises(ValueError):
+        unrank_hand(hand_count(5), 5)
+
+
+# test the canonical hand is shared by every suit renaming
+def test_canonicalize():
+    rng = random.Random(SEED)
+    for _ in range(50):
+        hand = rng.sample(range(52), 7)
+        expected = canonicalize(hand)
+        for suits in permutations(range(4)):
+            renamed = [suits[code // 13] * 13 + code % 13 for code in hand]
+            assert canonicalize(renamed) == expected
+            assert canonical_rank(renamed) == rank_hand(expected)
+
+
+def test_canonical_classes():
+    # The 169 starting hands of hold'em
+    classes = {canonical_rank(hand) for hand in combinations(range(52), 2)}
+    assert len(classes) == 169
+
+
+# test the batched variants
+@pytest.mark.parametrize('k', [2, 5, 7])
+def test_batch(k):
+    np = pytest.importorskip('numpy')
+    rng = random.Random(SEED)
+    hands = [rng.sample(range(52), k) for _ in range(200)]
+
+    indexes = rank_hands(hands)
+    assert indexes.tolist() == [rank_hand(hand) for hand in hands]
+    assert unrank_hands(indexes, k).tolist() \
+        == [sorted(hand) for hand in hands]
+    assert canonicalize_hands(np.array(hands)).tolist() \
+        == [list(canonicalize(hand)) for hand in hands]
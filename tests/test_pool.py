@@ -0,0 +1,82 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from src.pydecklib.deck import Deck
+from src.pydecklib.pool import DeckPool
+from src.pydecklib.template import PIQUET
+
+# Set the seed
+SEED = 42
+
+
+# test decks are reused
+def test_reuse():
+    pool = DeckPool(size=1, shuffle=False)
+    deck = pool.acquire()
+    assert len(pool) == 0
+    list(deck.draw(10))
+    pool.release(deck)
+
+    assert pool.acquire() is deck
+    assert deck == Deck()
+    assert pool.acquire() is not deck
+
+
+def test_context_manager():
+    pool = DeckPool(template=PIQUET)
+    with pool.deck() as deck:
+        assert deck.cards_count == 32
+    assert len(pool) == 1
+
+
+# test a seeded pool is reproducible
+def test_seed():
+    def play(pool):
+        hands = []
+        for _ in range(5):
+            with pool.deck() as deck:
+                hands.append(deck.deal(4, 2))
+        return hands
+
+    assert play(DeckPool(seed=SEED)) == play(DeckPool(seed=SEED))
+
+
+# test a deck cannot be released twice
+def test_double_release():
+    pool = DeckPool(size=1, seed=SEED)
+    deck = pool.acquire()
+    pool.release(deck)
+    with pytest.raises(ValueError):
+        pool.release(deck)
+    assert len(pool) == 1
+    assert pool.acquire() is deck
+    assert pool.acquire() is not deck
+
+
+# test reset reuses the buffer and the counters
+@pytest.mark.parametrize('shuffle', [False, True])
+def test_reset(shuffle):
+    deck = Deck(shuffle=True, seed=SEED)
+    deck.remaining()
+    buffer, counts = deck._deck, deck._counts
+    list(deck.draw(20))
+    list(deck.draw_bottom(3))
+
+    deck.reset(shuffle=shuffle, seed=SEED)
+    assert deck._deck is buffer and deck._counts is counts
+    assert sorted(deck.codes) == list(range(52))
+    assert deck.remaining() == 52 and deck.mask == (1 << 52) - 1
+    assert deck.zobrist == Deck(override=list(deck)).zobrist
+    if not shuffle:
+        assert deck == Deck()
+
+
+def test_reset_fork():
+    deck = Deck()
+    list(deck.draw(5))
+    child = deck.fork()
+    child.reset(shuffle=True)
+    assert deck.cards_count == 47
+    assert child.cards_count == 52
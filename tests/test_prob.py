@@ -0,0 +1,104 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from itertools import combinations
+
+import pytest
+
+from src.pydecklib import prob
+from src.pydecklib.card import Suit, Value
+from src.pydecklib.deck import Deck
+from src.pydecklib.prob import (
+    hypergeometric, pmf, probability, probability_all
+)
+
+# Set the seed
+SEED = 42
+
+
+def enumerate_hands(deck, draws, predicate):
+    hands = list(combinations(deck, draws))
+    return sum(map(predicate, hands)) / len(hands)
+
+
+# test hypergeometric
+test_values = [
+    (52, 4, 2, (188 / 221, 32 / 221, 1 / 221)),
+    (10, 0, 3, (1.0,)),
+    (5, 5, 5, (0, 0, 0, 0, 0, 1.0))
+]
+
+
+@pytest.mark.parametrize('population, successes, draws, expected',
+                         test_values)
+def test_hypergeometric(population, successes, draws, expected):
+    assert hypergeometric(population, successes, draws) \
+        == pytest.approx(expected)
+
+
+def test_hypergeometric_error():
+    with pytest.raises(ValueError):
+        hypergeometric(10, 2, 11)
+
+
+# test probability against an enumeration of the hands
+test_values = [
+    (Value.ACE, None, 1, None),
+    (None, Suit.HEARTS, 2, 3),
+    (Value.KING, Suit.SPADES, 1, None),
+    (None, Suit.CLUBS, 0, 0)
+]
+
+
+@pytest.mark.parametrize('value, suit, at_least, at_most', test_values)
+def test_probability(value, suit, at_least, at_most):
+    deck = Deck(shuffle=True, seed=SEED)
+    list(deck.draw(36))
+
+    def predicate(hand):
+        count = sum(
+            (value is None or card.value == value)
+            and (suit is None or card.suit == suit) for card in hand
+        )
+        return at_least <= count <= (at_most if at_most is not None else 4)
+
+    expected = enumerate_hands(deck, 4, predicate)
+    actual = probability(deck, 4, value, suit, at_least, at_most)
+    assert actual == pytest.approx(expected)
+    assert sum(pmf(deck, 4, value, suit)) == pytest.approx(1)
+
+
+# test probability_all against an enumeration of the hands
+test_values = [
+    {Suit.HEARTS: 1, Suit.SPADES: 1},
+    {Suit.DIAMONDS: 2},
+    {Value.ACE: 1, Value.TWO: 1, Value.THREE: 0}
+]
+
+
+@pytest.mark.parametrize('minimums', test_values)
+def test_probability_all(minimums):
+    deck = Deck(shuffle=True, seed=SEED)
+    list(deck.draw(34))
+
+    def predicate(hand):
+        return all(
+            sum(category in (card.suit, card.value) for card in hand)
+            >= minimum for category, minimum in minimums.items()
+        )
+
+    expected = enumerate_hands(deck, 4, predicate)
+    assert probability_all(deck, 4, minimums) == pytest.approx(expected)
+
+
+def test_probability_all_error():
+    with pytest.raises(ValueError):
+        probability_all(Deck(), 3, {Suit.HEARTS: 1, Value.ACE: 1})
+    with pytest.raises(ValueError):
+        probability_all(Deck(n=2), 3, {Suit.HEARTS: 1})
+
+
+# test the memoized tables are bounded
+def test_cache_bounded():
+    assert prob._ways.cache_info().maxsize is not None
+    assert hypergeometric.cache_info().maxsize is not None
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from src.pydecklib.deck import Deck
+from src.pydecklib.rng import (
+    derive_rng, dump_rng, load_rng, make_rng, spawn_rng
+)
+
+# Set the seed
+SEED = 42
+
+
+# test global random state is left untouched
+test_values = [
+    lambda: Deck(shuffle=True, seed=SEED),
+    lambda: list(Deck().draw_random(5, seed=SEED)),
+    lambda: Deck(initialise=False).add_cards([Deck()[0]], seed=SEED)
+]
+
+
+@pytest.mark.parametrize('operation', test_values)
+def test_global_state(operation):
+    random.seed(SEED)
+    expected = random.random()
+    random.seed(SEED)
+    operation()
+    actual = random.random()
+    assert actual == expected
+
+
+# test decks sharing a seed replay the same stream
+test_values = [None, random.Random, 'numpy']
+
+
+@pytest.mark.parametrize('factory', test_values)
+def test_replay(factory):
+    if factory == 'numpy':
+        np = pytest.importorskip('numpy')
+        factory = np.random.default_rng
+
+    def make():
+        rng = None if factory is None else factory(SEED)
+        deck = Deck(rng=rng, seed=None if rng is not None else SEED)
+        deck.shuffle()
+        return deck, list(deck.draw_random(5))
+
+    assert make() == make()
+
+
+# test spawn_rng
+test_values = [
+    random.Random(SEED),
+    make_rng(seed=0)
+]
+
+
+@pytest.mark.parametrize('rng', test_values)
+def test_spawn_rng(rng):
+    state = rng.getstate()
+    children = spawn_rng(rng, 3)
+    rng.setstate(state)
+    replayed = spawn_rng(rng, 3)
+    actual = [child.random() for child in children]
+    expected = [child.random() for child in replayed]
+    assert actual == expected
+    assert len(set(actual)) == 3
+
+
+def test_spawn_rng_numpy():
+    np = pytest.importorskip('numpy')
+    deck = Deck(rng=np.random.default_rng(SEED))
+    children = [Deck(shuffle=True, rng=rng) for rng in deck.spawn_rng(3)]
+    assert len({child.codes for child in children}) == 3
+
+
+# test derive_rng leaves the parent untouched
+def test_derive_rng():
+    rng = random.Random(SEED)
+    children = [derive_rng(rng, key) for key in range(3)]
+    assert rng.random() == random.Random(SEED).random()
+    assert len({child.random() for child in children}) == 3
+    replayed = derive_rng(random.Random(SEED), 1)
+    assert replayed.random() == derive_rng(random.Random(SEED), 1).random()
+
+
+# test NumPy children only depend on the state of the parent and the key
+@pytest.mark.parametrize('bit_generator', ['PCG64', 'Philox'])
+def test_derive_rng_numpy(bit_generator):
+    np = pytest.importorskip('numpy')
+    rng = make_rng(np.random.Generator(
+        getattr(np.random, bit_generator)(SEED)
+    ))
+    child = derive_rng(rng, 1)
+    assert isinstance(child, type(rng))
+    assert derive_rng(rng, 0).random() != child.random()
+    replayed = derive_rng(make_rng(np.random.Generator(
+        getattr(np.random, bit_generator)(SEED)
+    )), 1)
+    assert replayed.random() == derive_rng(rng, 1).random()
+    if bit_generator == 'PCG64':
+        restored = load_rng(dump_rng(rng))
+        assert derive_rng(restored, 1).random() == \
+            derive_rng(rng, 1).random()
+
+
+# test dump_rng and load_rng
+test_values = [None, random.Random, 'numpy']
+
+
+@pytest.mark.parametrize('factory', test_values)
+def test_dump_rng(factory):
+    if factory is None:
+        assert load_rng(dump_rng(None)) is None
+        return
+    if factory == 'numpy':
+        np = pytest.importorskip('numpy')
+        factory = np.random.default_rng
+    rng = factory(SEED)
+    rng.random()
+    restored = load_rng(dump_rng(rng))
+    rng = make_rng(rng)
+    assert [restored.randint(0, 51) for _ in range(10)] \
+        == [rng.randint(0, 51) for _ in range(10)]
+
+
+def test_dump_rng_error():
+    np = pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        dump_rng(np.random.Generator(np.random.MT19937(SEED)))
+    with pytest.raises(ValueError):
+        load_rng(bytes([255]))
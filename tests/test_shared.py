@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.pydecklib.deck import Deck
+from src.pydecklib.rng import NumpyRandom
+from src.pydecklib.shared import SharedDeckBatch
+from src.pydecklib.template import PIQUET
+
+# Set the seed
+SEED = 42
+
+
+def copy_top(shared, start, stop):
+    with shared:
+        codes = shared.codes(start, stop, as_array=False)
+        out = shared.results(start, stop, as_array=False)
+        for i in range(stop - start):
+            out[i] = codes[i * shared.cards_count]
+        del codes, out
+    return stop - start
+
+
+# test shuffling and views
+@pytest.mark.parametrize('template', [None, PIQUET])
+def test_shared_batch(template):
+    with SharedDeckBatch(5, shuffle=True, seed=SEED,
+                         template=template) as shared:
+        cards = shared.cards_count
+        assert len(shared) == 5
+        with shared.codes(as_array=False) as codes:
+            rows = [bytes(codes[i * cards:(i + 1) * cards])
+                    for i in range(5)]
+        expected = Deck(template=template).codes
+        assert all(sorted(row) == sorted(expected) for row in rows)
+        assert len(set(rows)) == 5
+        assert shared.deck(2).codes == rows[2]
+        with pytest.raises(IndexError):
+            shared.deck(5)
+
+
+def test_shared_batch_reproducible():
+    with SharedDeckBatch(3, shuffle=True, seed=SEED) as first, \
+            SharedDeckBatch(3, shuffle=True, seed=SEED) as second:
+        assert [first[i] for i in range(3)] == [second[i] for i in range(3)]
+
+
+# test workers attached by pickling
+def test_shared_batch_workers():
+    with SharedDeckBatch(40, shuffle=True, seed=SEED) as shared:
+        assert len(pickle.dumps(shared)) < 200
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            done = list(executor.map(
+                copy_top, [shared] * 4, range(0, 40, 10), range(10, 41, 10)
+            ))
+        assert done == [10] * 4
+        with shared.results(as_array=False) as out:
+            assert list(out) == [shared[i][0].code for i in range(40)]
+
+
+def test_shared_batch_numpy():
+    np = pytest.importorskip('numpy')
+    with SharedDeckBatch(100, shuffle=True, rng=np.random.default_rng(SEED),
+                         results=2) as shared:
+        codes = shared.codes(10, 20)
+        assert codes.shape == (10, 52)
+        assert (np.sort(codes, axis=1) == np.arange(52)).all()
+        hands = shared.batch(10, 20).deal(2, 2)
+        assert (hands[:, 0, 0] == codes[:, 0]).all()
+        out = shared.results(10, 20)
+        out[:, 1] = codes[:, 0]
+        assert (shared.results()[10:20, 1] == codes[:, 0]).all()
+        del codes, hands, out
+
+
+# test the batch shuffles with NumPy by default
+def test_shared_batch_default_rng():
+    pytest.importorskip('numpy')
+    with SharedDeckBatch(3, shuffle=True, seed=SEED) as shared:
+        assert isinstance(shared._rng, NumpyRandom)
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+
+import pytest
+
+from src.pydecklib.card import Value
+from src.pydecklib.deck import Deck
+from src.pydecklib.shoe import Shoe
+
+# Set the seed
+SEED = 42
+
+
+# test cut card
+test_values = [
+    (6, 0.75, 234),
+    (8, 0.5, 208),
+    (1, 1, 52)
+]
+
+
+@pytest.mark.parametrize('decks, penetration, expected', test_values)
+def test_cut_card(decks, penetration, expected):
+    shoe = Shoe(decks=decks, penetration=penetration, seed=SEED)
+    assert shoe.cut_card == expected
+    list(shoe.draw(expected - 1))
+    assert not shoe.needs_reshuffle
+    list(shoe.draw())
+    assert shoe.needs_reshuffle
+
+
+# test reshuffle puts every card back
+def test_reshuffle():
+    shoe = Shoe(decks=2, seed=SEED)
+    first = [card.code for card in shoe.draw(80)]
+    list(shoe.draw_bottom(3))
+    shoe.reshuffle()
+    assert shoe.cards_count == 104
+    second = [card.code for card in shoe.draw(80)]
+    assert first != second
+    counts = Counter(shoe.codes) + Counter(second)
+    assert counts == Counter(list(range(52)) * 2)
+
+
+# test reshuffle restores the shoe after cards were moved within it
+def test_reshuffle_after_add():
+    shoe = Shoe(decks=1, shuffle=False)
+    card = next(shoe.draw())
+    shoe.add_card(card, position=5)
+    list(shoe.draw_bottom())
+    shoe.reshuffle(seed=SEED)
+    assert Counter(shoe.codes) == Counter(range(52))
+    assert shoe.remaining() == 52
+
+
+# test the lazy shuffle is reproducible and matches the shoe contents
+def test_lazy_shuffle():
+    a, b = Shoe(decks=2, seed=SEED), Shoe(decks=2, seed=SEED)
+    assert list(a.draw(10)) == list(b.draw(10))
+    assert a == b
+    rest = list(a)
+    assert list(a.draw(len(rest))) == rest
+
+
+# test remaining counts
+test_values = [
+    lambda shoe: list(shoe.draw(100)),
+    lambda shoe: list(shoe.draw_bottom(30)),
+    lambda shoe: list(shoe.draw_random(30)),
+    lambda shoe: shoe.add_card(Deck()[0]),
+    lambda shoe: shoe.add_cards(list(shoe.draw(40))),
+    lambda shoe: shoe.deal(7, 2)
+]
+
+
+@pytest.mark.parametrize('operation', test_values)
+def test_remaining(operation):
+    shoe = Shoe(decks=6, seed=SEED)
+    operation(shoe)
+    expected = Counter(card.value for card in shoe)
+    actual = {value: shoe.remaining(value) for value in Value}
+    assert actual == {value: expected[value] for value in Value}
+
+
+def test_remaining_after_reshuffle(monkeypatch):
+    shoe = Shoe(decks=6, seed=SEED)
+    list(shoe.draw(100))
+    list(shoe.draw_bottom(10))
+    shoe.reshuffle()
+
+    # The counters are refilled without scanning the shoe
+    monkeypatch.setattr(Shoe, '_compute_counts', None)
+    assert shoe.remaining(Value.ACE) == 24
+    assert shoe.remaining() == 312
+    assert shoe.mask == (1 << 52) - 1
+    list(shoe.draw(10))
+    assert shoe.remaining() == 302
+
+
+# test forks are independent
+def test_fork():
+    shoe = Shoe(decks=2, seed=SEED)
+    list(shoe.draw(10))
+    expected = list(shoe)
+    child = shoe.fork()
+    assert list(child.draw(50)) == expected[:50]
+    assert child.remaining(Value.ACE) == sum(
+        card.value == Value.ACE for card in expected[50:])
+    child.reshuffle()
+    assert child.cards_count == 104
+    assert list(shoe) == expected
+
+
+# test rollback restores the shoe and its counts
+def test_rollback():
+    shoe = Shoe(decks=2, penetration=0.5, seed=SEED)
+    expected = []
+    for _ in range(20):
+        cards = list(shoe.copy())
+        counts = [shoe.remaining(value) for value in Value]
+        expected.append((shoe.checkpoint(), cards, counts))
+        list(shoe.draw(7))
+        list(shoe.draw_random(2))
+        shoe.add_card(Deck()[0])
+        if shoe.needs_reshuffle:
+            shoe.reshuffle()
+
+    for checkpoint, cards, counts in reversed(expected):
+        shoe.rollback(checkpoint)
+        assert list(shoe) == cards
+        assert [shoe.remaining(value) for value in Value] == counts
+
+
+# test the hash follows the dealt cards
+@pytest.mark.parametrize('hash_mode', ['ordered', 'composition'])
+def test_zobrist(hash_mode):
+    shoe = Shoe(decks=2, seed=SEED, hash_mode=hash_mode)
+    hash(shoe)
+    list(shoe.draw(20))
+    shoe.add_cards(list(shoe.draw(5)))
+    expected = Deck(override=list(shoe), hash_mode=hash_mode)
+    assert shoe.zobrist == expected.zobrist
+
+
+# test reset restores every deck of the shoe in place
+def test_reset():
+    shoe = Shoe(decks=2, seed=SEED)
+    list(shoe.draw_random(30))
+    buffer = shoe._deck
+    shoe.reset(shuffle=True)
+    assert shoe._deck is buffer
+    assert shoe.cards_count == 104
+    assert shoe.remaining(Value.ACE) == 8
+    assert sorted(shoe.codes) == sorted(Deck().codes * 2)
@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import operator
+
+import pytest
+
+from src.pydecklib.card import Value
+from src.pydecklib.sim import seed_stream, simulate, simulate_shared
+
+# Set the seed
+SEED = 42
+
+
+def top_code(deck):
+    return next(deck.draw()).code
+
+
+def count_aces(batch):
+    return int((batch.deal(1, 1)[:, 0, 0] % 13 == Value.ACE.value - 1).sum())
+
+
+# test seed_stream
+def test_seed_stream():
+    seeds = seed_stream(SEED)
+    actual = [next(seeds) for _ in range(5)]
+    replayed = seed_stream(SEED)
+    assert actual == [next(replayed) for _ in range(5)]
+    assert len(set(actual)) == 5
+
+
+# test results do not depend on the number of workers
+test_values = [
+    (None, 2500, 1000),
+    (operator.add, 2500, 1000),
+    (operator.add, 10, 3)
+]
+
+
+@pytest.mark.parametrize('reduce, trials, chunk_size', test_values)
+def test_simulate(reduce, trials, chunk_size):
+    expected = simulate(
+        top_code, trials, reduce=reduce, seed=SEED, workers=1,
+        chunk_size=chunk_size
+    )
+    actual = simulate(
+        top_code, trials, reduce=reduce, seed=SEED, workers=2,
+        chunk_size=chunk_size
+    )
+    assert actual == expected
+    if reduce is None:
+        assert len(actual) == trials
+
+
+# test batch mode
+def test_simulate_batch():
+    pytest.importorskip('numpy')
+    actual = simulate(
+        count_aces, 4000, reduce=operator.add, seed=SEED, workers=2,
+        batch=True
+    )
+    expected = simulate(
+        count_aces, 4000, reduce=operator.add, seed=SEED, workers=1,
+        batch=True
+    )
+    assert actual == expected
+    assert 150 < actual < 470
+
+
+# test shared memory mode
+def top_is_ace(batch, out):
+    out[:, 0] = batch.deal(1, 1)[:, 0, 0] % 13 == Value.ACE.value - 1
+
+
+def test_simulate_shared():
+    pytest.importorskip('numpy')
+    expected = simulate_shared(
+        top_is_ace, 4000, seed=SEED, workers=1, chunk_size=500
+    )
+    actual = simulate_shared(
+        top_is_ace, 4000, seed=SEED, workers=2, chunk_size=500
+    )
+    assert actual.shape == (4000, 1)
+    assert (actual == expected).all()
+    assert 150 < actual.sum() < 470
@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+
+import pytest
+
+from src.pydecklib.card import Card, Suit, Value
+from src.pydecklib.deck import Deck, DeckBatch
+from src.pydecklib.shoe import Shoe
+from src.pydecklib.template import (
+    DOUBLE, PINOCHLE, PIQUET, STANDARD, DeckTemplate
+)
+
+# Set the seed
+SEED = 42
+
+
+# test the predefined templates
+test_values = [
+    (STANDARD, 52, 13, 1),
+    (PIQUET, 32, 8, 1),
+    (PINOCHLE, 48, 6, 2),
+    (DOUBLE, 104, 13, 2)
+]
+
+
+@pytest.mark.parametrize('template, cards_count, values, copies',
+                         test_values)
+def test_templates(template, cards_count, values, copies):
+    assert template.cards_count == cards_count
+    assert len(template.values) == values
+    assert set(Counter(template.codes).values()) == {copies}
+    assert template.cards[0] == Card(Suit.SPADES, template.values[0])
+
+
+def test_standard():
+    assert Deck(template=STANDARD) == Deck()
+    assert STANDARD == DeckTemplate()
+    assert hash(STANDARD) == hash(DeckTemplate())
+
+
+# test decks built from a template
+def test_deck():
+    deck = Deck(shuffle=True, seed=SEED, template=PIQUET)
+    assert sorted(deck.codes) == sorted(PIQUET.codes)
+    assert deck.remaining(Value.TWO) == 0
+    list(deck.draw(10))
+    deck.initialise()
+    assert deck.codes == PIQUET.codes
+    assert deck.copy().template is PIQUET
+    assert deck.fork().template is PIQUET
+
+
+def test_shoe():
+    shoe = Shoe(decks=2, seed=SEED, template=PINOCHLE)
+    assert shoe.cards_count == 96
+    assert shoe.remaining(Value.NINE) == 16
+    list(shoe.draw(50))
+    shoe.reshuffle()
+    assert sorted(shoe.codes) == sorted(PINOCHLE.codes * 2)
+
+
+def test_batch():
+    pytest.importorskip('numpy')
+    batch = DeckBatch(3, shuffle=True, seed=SEED, template=PIQUET)
+    assert batch.cards_count == 32
+    assert sorted(batch[0].codes) == sorted(PIQUET.codes)
+
+
+# test invalid specs
+test_values = [
+    dict(values=()),
+    dict(suits=(Suit.SPADES, Suit.SPADES)),
+    dict(copies=0)
+]
+
+
+@pytest.mark.parametrize('spec', test_values)
+def test_invalid(spec):
+    with pytest.raises(ValueError):
+        DeckTemplate(**spec)
+
+
+def test_immutable():
+    with pytest.raises(AttributeError):
+        PIQUET._copies = 3